@@ -99,7 +99,14 @@ describe('sqlite-pool legacy investment holdings migration', () => {
 
     const startupSql = execCalls.join('\n');
 
-    expect(pragmaCalls).toEqual(['foreign_keys = ON', 'journal_mode = WAL']);
+    expect(pragmaCalls).toEqual([
+      'foreign_keys = ON',
+      'journal_mode = WAL',
+      'synchronous = NORMAL',
+      'temp_store = MEMORY',
+      'cache_size = -65536',
+      'mmap_size = 268435456',
+    ]);
     expect(getCalls).toContainEqual({
       sql: "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
       params: ['investment_holdings'],
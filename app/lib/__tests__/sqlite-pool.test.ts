@@ -98,7 +98,14 @@ describe('sqlite-pool', () => {
     await loadPool();
     expect(latestDb?.path).toBe(dbPath);
     expect(latestDb?.options).toEqual({ fileMustExist: true });
-    expect(latestDb?.pragmaCalls).toEqual(['foreign_keys = ON', 'journal_mode = WAL']);
+    expect(latestDb?.pragmaCalls).toEqual([
+      'foreign_keys = ON',
+      'journal_mode = WAL',
+      'synchronous = NORMAL',
+      'temp_store = MEMORY',
+      'cache_size = -65536',
+      'mmap_size = 268435456',
+    ]);
   });
 
   it('converts positional placeholders and normalises params for SELECT', async () => {
@@ -123,6 +130,17 @@ describe('sqlite-pool', () => {
     expect(stmt!.runCalls[0]).toEqual([0, 3]);
   });
 
+  it('reuses the prepared statement for repeated SQL text', async () => {
+    const pool = await loadPool();
+
+    await pool.query('SELECT * FROM foo WHERE id = $1', [1]);
+    await pool.query('SELECT * FROM foo WHERE id = $1', [2]);
+
+    const prepared = latestDb!.statements.filter((record) => record.sql === 'SELECT * FROM foo WHERE id = ?');
+    expect(prepared).toHaveLength(1);
+    expect(prepared[0].allCalls).toEqual([[1], [2]]);
+  });
+
   it('executes transaction control statements directly', async () => {
     const pool = await loadPool();
 
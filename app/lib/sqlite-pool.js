@@ -3,6 +3,8 @@ const fs = require('fs');
 const resolveBetterSqlite = require('./better-sqlite3-wrapper.js');
 
 const PLACEHOLDER_REGEX = /\$(\d+)/g;
+const STATEMENT_CACHE_SIZE = 256;
+const SLOW_STARTUP_INDEX_MS = 500;
 const SELECT_LIKE_REGEX = /^\s*(WITH|SELECT|PRAGMA)/i;
 const RETURNING_REGEX = /\bRETURNING\b/i;
 
@@ -511,11 +513,60 @@ function ensureOptimizerTables(db) {
   });
 }
 
+const STARTUP_INDEX_STATEMENTS = [
+  'CREATE INDEX IF NOT EXISTS idx_pairing_exclusions_pairing_id ON transaction_pairing_exclusions(pairing_id);',
+  'CREATE INDEX IF NOT EXISTS idx_pairing_exclusions_txn ON transaction_pairing_exclusions(transaction_identifier, transaction_vendor);',
+  'CREATE INDEX IF NOT EXISTS idx_transactions_processed_date ON transactions (processed_date);',
+  'CREATE INDEX IF NOT EXISTS idx_transactions_status_date ON transactions (status, date);',
+  'CREATE INDEX IF NOT EXISTS idx_transactions_date_desc ON transactions (date DESC);',
+  'CREATE INDEX IF NOT EXISTS idx_transactions_category_date ON transactions (category_definition_id, date);',
+  'CREATE INDEX IF NOT EXISTS idx_transactions_category_def ON transactions (category_definition_id);',
+  'CREATE INDEX IF NOT EXISTS idx_transactions_vendor_date ON transactions (vendor, date);',
+  'CREATE INDEX IF NOT EXISTS idx_transactions_vendor ON transactions (vendor);',
+  'CREATE INDEX IF NOT EXISTS idx_transactions_name ON transactions (name COLLATE NOCASE);',
+  'CREATE INDEX IF NOT EXISTS idx_transactions_vendor_account_cycle_date ON transactions (vendor, account_number, substr(COALESCE(processed_date, date), 1, 10));',
+  `CREATE INDEX IF NOT EXISTS idx_transactions_debits_vendor_date ON transactions (vendor, date) WHERE status = 'completed' AND price < 0;`,
+  `CREATE INDEX IF NOT EXISTS idx_transactions_debits_vendor_account_date ON transactions (vendor, account_number, date) WHERE status = 'completed' AND price < 0;`,
+  'CREATE INDEX IF NOT EXISTS idx_category_definitions_type ON category_definitions (category_type);',
+  'CREATE INDEX IF NOT EXISTS idx_category_definitions_parent ON category_definitions (parent_id);',
+  // Superseded by the indexes above; dropped so transaction writes stop maintaining them
+  'DROP INDEX IF EXISTS idx_transactions_debits_vendor_account_cycle;',
+  'DROP INDEX IF EXISTS idx_transactions_vendor_account_day;',
+];
+
 /**
  * Run startup-critical, idempotent schema migrations/fixes before the pool is returned.
  * These tables/columns are queried immediately by request handlers, so they must exist
  * before the first caller can use the database connection.
  */
+/**
+ * Create the startup indexes in one transaction: a single journal commit instead of
+ * one per DDL. The first open of a large existing database builds any new indexes
+ * here, so report how long that took when it is noticeable.
+ */
+function createStartupIndexes(db) {
+  const startedAt = Date.now();
+  db.exec('BEGIN');
+  try {
+    db.exec(STARTUP_INDEX_STATEMENTS.join('\n'));
+    db.exec('COMMIT');
+  } catch (error) {
+    if (db.inTransaction) {
+      try {
+        db.exec('ROLLBACK');
+      } catch (_rollbackError) {
+        // Ignore: surface the index failure rather than the rollback's.
+      }
+    }
+    throw error;
+  }
+
+  const elapsedMs = Date.now() - startedAt;
+  if (elapsedMs >= SLOW_STARTUP_INDEX_MS) {
+    console.info(`[sqlite-pool] Built startup indexes in ${elapsedMs}ms`);
+  }
+}
+
 function runStartupSchemaMigrations(db) {
   try {
     const pairingColumns = db.prepare("PRAGMA table_info('account_pairings')").all();
@@ -553,18 +604,7 @@ function runStartupSchemaMigrations(db) {
         FOREIGN KEY (pairing_id) REFERENCES account_pairings(id) ON DELETE CASCADE
       );
     `);
-    db.exec('CREATE INDEX IF NOT EXISTS idx_pairing_exclusions_pairing_id ON transaction_pairing_exclusions(pairing_id);');
-    db.exec('CREATE INDEX IF NOT EXISTS idx_pairing_exclusions_txn ON transaction_pairing_exclusions(transaction_identifier, transaction_vendor);');
-    db.exec('CREATE INDEX IF NOT EXISTS idx_transactions_processed_date ON transactions (processed_date);');
-    db.exec('CREATE INDEX IF NOT EXISTS idx_transactions_status_date ON transactions (status, date);');
-    db.exec('CREATE INDEX IF NOT EXISTS idx_transactions_date_desc ON transactions (date DESC);');
-    db.exec('CREATE INDEX IF NOT EXISTS idx_transactions_category_date ON transactions (category_definition_id, date);');
-    db.exec('CREATE INDEX IF NOT EXISTS idx_transactions_category_def ON transactions (category_definition_id);');
-    db.exec('CREATE INDEX IF NOT EXISTS idx_transactions_vendor_date ON transactions (vendor, date);');
-    db.exec('CREATE INDEX IF NOT EXISTS idx_transactions_vendor ON transactions (vendor);');
-    db.exec('CREATE INDEX IF NOT EXISTS idx_transactions_name ON transactions (name COLLATE NOCASE);');
-    db.exec('CREATE INDEX IF NOT EXISTS idx_category_definitions_type ON category_definitions (category_type);');
-    db.exec('CREATE INDEX IF NOT EXISTS idx_category_definitions_parent ON category_definitions (parent_id);');
+    createStartupIndexes(db);
     db.exec(`
       CREATE UNIQUE INDEX IF NOT EXISTS idx_investment_holdings_standard_snapshot_unique
       ON investment_holdings(account_id, as_of_date)
@@ -577,6 +617,10 @@ function runStartupSchemaMigrations(db) {
         AND deposit_transaction_id IS NOT NULL
         AND deposit_transaction_vendor IS NOT NULL;
     `);
+    db.exec(`
+      CREATE INDEX IF NOT EXISTS idx_investment_holdings_return_txn
+      ON investment_holdings(return_transaction_id, return_transaction_vendor);
+    `);
     db.exec(`
       CREATE TABLE IF NOT EXISTS profile_assessments (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -931,6 +975,12 @@ function createSqlitePool(options = {}) {
   const db = new Database(dbPath, { fileMustExist: true });
   db.pragma('foreign_keys = ON');
   db.pragma('journal_mode = WAL');
+  // Read-heavy analytics: WAL makes NORMAL sync durable enough, keep temp B-trees in
+  // memory, and serve pages from a modest cache (64 MiB) / memory map (256 MiB).
+  db.pragma('synchronous = NORMAL');
+  db.pragma('temp_store = MEMORY');
+  db.pragma('cache_size = -65536');
+  db.pragma('mmap_size = 268435456');
 
   // Startup-critical schema objects must exist before the pool is exposed.
   runStartupSchemaMigrations(db);
@@ -944,13 +994,34 @@ function createSqlitePool(options = {}) {
     }
   });
 
-  const prepareStatement = (sql, params) => {
+  // Reuse compiled statements for repeated SQL text (LRU via Map insertion order).
+  const statementCache = new Map();
+
+  const getCachedStatement = (sql) => {
+    const cached = statementCache.get(sql);
+    if (cached) {
+      statementCache.delete(sql);
+      statementCache.set(sql, cached);
+      return cached;
+    }
+
     const indices = [];
     const convertedSql = sql.replace(PLACEHOLDER_REGEX, (_, index) => {
       const zeroBased = Number.parseInt(index, 10) - 1;
       indices.push(zeroBased);
       return '?';
     });
+    const entry = { stmt: db.prepare(convertedSql), convertedSql, indices };
+
+    statementCache.set(sql, entry);
+    if (statementCache.size > STATEMENT_CACHE_SIZE) {
+      statementCache.delete(statementCache.keys().next().value);
+    }
+    return entry;
+  };
+
+  const prepareStatement = (sql, params) => {
+    const { stmt, convertedSql, indices } = getCachedStatement(sql);
 
     if (indices.length > 0) {
       if (!Array.isArray(params)) {
@@ -962,12 +1033,10 @@ function createSqlitePool(options = {}) {
         }
         return normalizeValue(params[idx]);
       });
-      const stmt = db.prepare(convertedSql);
       return { stmt, convertedSql, normalizedParams };
     }
 
     const normalizedParams = normalizeParams(params);
-    const stmt = db.prepare(convertedSql);
     return { stmt, convertedSql, normalizedParams };
   };
 
@@ -1195,6 +1264,7 @@ function createSqlitePool(options = {}) {
     connect,
     close: () => {
       isClosed = true;
+      statementCache.clear();
       db.close();
     },
     _db: db,
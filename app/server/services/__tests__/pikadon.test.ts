@@ -1,6 +1,7 @@
 import { afterEach, beforeAll, beforeEach, describe, expect, it, vi } from 'vitest';
 
 const queryMock = vi.fn();
+const releaseMock = vi.fn();
 
 let pikadonModule: any;
 
@@ -10,7 +11,11 @@ beforeAll(async () => {
 
 beforeEach(() => {
   queryMock.mockReset();
-  pikadonModule.__setDatabase({ query: queryMock });
+  releaseMock.mockReset();
+  pikadonModule.__setDatabase({
+    query: queryMock,
+    getClient: async () => ({ query: queryMock, release: releaseMock }),
+  });
 });
 
 afterEach(() => {
@@ -476,16 +481,17 @@ describe('pikadon service', () => {
         ],
       })
       .mockResolvedValueOnce({
-        rows: [{ identifier: 'dep-1', vendor: 'leumi', name: 'Deposit', price: -1000 }],
-      })
-      .mockResolvedValueOnce({
-        rows: [{ identifier: 'ret-1', vendor: 'leumi', name: 'Return', price: 1100 }],
+        rows: [
+          { identifier: 'ret-1', vendor: 'leumi', name: 'Return', price: 1100 },
+          { identifier: 'dep-1', vendor: 'leumi', name: 'Deposit', price: -1000 },
+        ],
       })
       .mockResolvedValueOnce({ rows: [] });
 
     const result = await pikadonModule.listPikadon({ includeTransactions: true });
 
-    expect(queryMock).toHaveBeenCalledTimes(4);
+    expect(queryMock).toHaveBeenCalledTimes(3);
+    expect(queryMock.mock.calls[1][1]).toEqual(['dep-1', 'ret-1', 'leumi']);
     expect(result.pikadon).toHaveLength(1);
     const holding = result.pikadon[0];
     expect(holding.current_value).toBe(1100);
@@ -532,13 +538,13 @@ describe('pikadon service', () => {
             account_number: '123',
           },
         ],
-      })
-      .mockResolvedValueOnce({ rows: [] })
-      .mockResolvedValueOnce({ rows: [] });
+      });
 
     const result = await pikadonModule.detectPikadonPairs({});
 
-    expect(queryMock).toHaveBeenCalledTimes(4);
+    expect(queryMock).toHaveBeenCalledTimes(2);
+    expect(queryMock.mock.calls[0][0]).toContain('ih.deposit_transaction_id = t.identifier');
+    expect(queryMock.mock.calls[1][0]).toContain('ih.return_transaction_id = t.identifier');
     expect(result.suggestions).toHaveLength(1);
     const suggestion = result.suggestions[0];
     expect(suggestion.deposit_amount).toBe(1000);
@@ -1055,6 +1061,10 @@ describe('pikadon service', () => {
         return { rows: [], rowCount: 1 };
       }
 
+      if (sql === 'BEGIN' || sql === 'COMMIT') {
+        return { rows: [] };
+      }
+
       throw new Error(`Unexpected auto-setup query: ${sql}`);
     });
 
@@ -1090,6 +1100,13 @@ describe('pikadon service', () => {
       String(sql).includes('UPDATE transactions SET is_pikadon_related = 1'),
     );
     expect(markCalls).toHaveLength(7);
+
+    const statements = queryMock.mock.calls.map(([sql]) => String(sql));
+    const beginIndex = statements.indexOf('BEGIN');
+    expect(beginIndex).toBeGreaterThan(-1);
+    expect(statements.findIndex((sql) => sql.includes('INSERT INTO investment_holdings'))).toBeGreaterThan(beginIndex);
+    expect(statements[statements.length - 1]).toBe('COMMIT');
+    expect(releaseMock).toHaveBeenCalledTimes(1);
   });
 
   it('listPikadon applies filters and does not fetch linked txns when ids are missing', async () => {
@@ -1198,15 +1215,6 @@ describe('pikadon service', () => {
     queryMock
       .mockResolvedValueOnce({
         rows: [
-          {
-            identifier: 'dep-linked',
-            vendor: 'bank-a',
-            date: '2025-01-01',
-            name: 'פיקדון',
-            memo: '',
-            price: '-1000',
-            account_number: '001',
-          },
           {
             identifier: 'dep-1',
             vendor: 'bank-a',
@@ -1229,15 +1237,6 @@ describe('pikadon service', () => {
       })
       .mockResolvedValueOnce({
         rows: [
-          {
-            identifier: 'ret-linked',
-            vendor: 'bank-a',
-            date: '2025-03-01',
-            name: 'פיקדון החזר',
-            memo: '',
-            price: '1040',
-            account_number: '001',
-          },
           {
             identifier: 'ret-1',
             vendor: 'bank-a',
@@ -1257,12 +1256,6 @@ describe('pikadon service', () => {
             account_number: '999',
           },
         ],
-      })
-      .mockResolvedValueOnce({
-        rows: [{ deposit_transaction_id: 'dep-linked', deposit_transaction_vendor: 'bank-a' }],
-      })
-      .mockResolvedValueOnce({
-        rows: [{ return_transaction_id: 'ret-linked', return_transaction_vendor: 'bank-a' }],
       });
 
     const result = await pikadonModule.detectPikadonPairs({
@@ -1558,6 +1551,9 @@ describe('pikadon service', () => {
       if (sql.includes("SET status = 'superseded'")) {
         return { rows: [], rowCount: 1 };
       }
+      if (sql === 'BEGIN' || sql === 'COMMIT') {
+        return { rows: [] };
+      }
       throw new Error(`Unexpected auto-setup query: ${sql}`);
     });
 
@@ -1588,6 +1584,43 @@ describe('pikadon service', () => {
     expect(markCalls).toHaveLength(5);
   });
 
+  it('auto-setup rolls back all writes when a holding insert fails', async () => {
+    queryMock.mockImplementation(async (sql: string) => {
+      if (sql.includes('SELECT id, account_name FROM investment_accounts WHERE id = $1')) {
+        return { rows: [{ id: 10, account_name: 'Main Bank' }] };
+      }
+      if (sql.includes('FROM transactions t') && sql.includes('WHERE (LOWER(t.name) LIKE $1')) {
+        return {
+          rows: [
+            {
+              identifier: 'dep-start',
+              vendor: 'bank-a',
+              date: '2026-01-01',
+              name: 'הפקדה לפיקדון',
+              price: '-1000',
+              account_number: '123',
+            },
+          ],
+        };
+      }
+      if (sql.includes('INSERT INTO investment_holdings')) {
+        throw new Error('insert failed');
+      }
+      if (sql === 'BEGIN' || sql === 'ROLLBACK') {
+        return { rows: [] };
+      }
+      throw new Error(`Unexpected auto-setup query: ${sql}`);
+    });
+
+    await expect(pikadonModule.autoSetupPikadon(10, { vendor: 'bank-a' })).rejects.toThrow('insert failed');
+
+    const statements = queryMock.mock.calls.map(([sql]) => String(sql));
+    expect(statements).toContain('BEGIN');
+    expect(statements[statements.length - 1]).toBe('ROLLBACK');
+    expect(statements).not.toContain('COMMIT');
+    expect(releaseMock).toHaveBeenCalledTimes(1);
+  });
+
   it('classifies pikadon return candidates conservatively', () => {
     expect(pikadonModule.transactionLooksLikePikadonReturn({
       name: 'משיכה מפיקדון נזיל',
@@ -0,0 +1,221 @@
+const assert = require('assert/strict');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+const autoPairingService = require('../auto-pairing.js');
+const createSqlitePool = require('../../../../lib/sqlite-pool.js');
+const { initializeSqliteDatabase } = require('../../../../../scripts/init_sqlite_db.js');
+
+const MONTHS_BACK = 3;
+
+function daysAgo(days, time = '00:00:00') {
+  const date = new Date(Date.now() - days * 24 * 60 * 60 * 1000);
+  return `${date.toISOString().split('T')[0]}T${time}.000Z`;
+}
+
+async function withDatabase(run) {
+  const tempDir = fs.mkdtempSync(path.join(os.tmpdir(), 'shekelsync-auto-pairing-'));
+  const databasePath = path.join(tempDir, 'auto-pairing.sqlite');
+  let pool;
+  const originalLog = console.log;
+  try {
+    console.log = () => {};
+    initializeSqliteDatabase({ output: databasePath, force: true, withDemo: false });
+    console.log = originalLog;
+    pool = createSqlitePool({ databasePath });
+    autoPairingService.__setDatabase({ getClient: () => pool.connect(), getPool: () => pool });
+    await run(pool);
+  } finally {
+    console.log = originalLog;
+    autoPairingService.__resetDatabase();
+    pool?.close();
+    fs.rmSync(tempDir, { recursive: true, force: true });
+  }
+}
+
+async function getCategoryId(pool, nameEn) {
+  const row = (await pool.query(
+    'SELECT id FROM category_definitions WHERE name_en = $1 LIMIT 1',
+    [nameEn],
+  )).rows[0];
+  assert.ok(row, `missing seeded category ${nameEn}`);
+  return row.id;
+}
+
+async function insertTransactions(pool, rows) {
+  let counter = 0;
+  for (const row of rows) {
+    counter += 1;
+    await pool.query(
+      `
+        INSERT INTO transactions (
+          identifier, vendor, date, name, price, type, processed_date,
+          status, auto_categorized, confidence_score, account_number, category_definition_id
+        ) VALUES ($1, $2, $3, $4, $5, 'normal', $6, 'completed', 0, 1.0, $7, $8)
+      `,
+      [
+        `${row.vendor}-${counter}`,
+        row.vendor,
+        row.date,
+        row.name,
+        row.price,
+        row.processedDate || row.date,
+        row.accountNumber ?? null,
+        row.categoryId ?? null,
+      ],
+    );
+  }
+}
+
+async function insertPairings(pool, pairings) {
+  const inserted = [];
+  for (const pairing of pairings) {
+    const row = (await pool.query(
+      `
+        INSERT INTO account_pairings (
+          credit_card_vendor, credit_card_account_number, bank_vendor, bank_account_number,
+          match_patterns, is_active, discrepancy_acknowledged
+        ) VALUES ($1, $2, $3, $4, '[]', 1, $5)
+        RETURNING id
+      `,
+      [
+        pairing.creditCardVendor,
+        pairing.creditCardAccountNumber,
+        pairing.bankVendor,
+        pairing.bankAccountNumber,
+        pairing.acknowledged ? 1 : 0,
+      ],
+    )).rows[0];
+    inserted.push({
+      id: row.id,
+      bankVendor: pairing.bankVendor,
+      bankAccountNumber: pairing.bankAccountNumber,
+      creditCardVendor: pairing.creditCardVendor,
+      creditCardAccountNumber: pairing.creditCardAccountNumber,
+    });
+  }
+  return inserted;
+}
+
+async function calculateEachPairing(pairings) {
+  const results = [];
+  for (const pairing of pairings) {
+    results.push(await autoPairingService.calculateDiscrepancy({
+      pairingId: pairing.id,
+      bankVendor: pairing.bankVendor,
+      bankAccountNumber: pairing.bankAccountNumber,
+      ccVendor: pairing.creditCardVendor,
+      ccAccountNumber: pairing.creditCardAccountNumber,
+      monthsBack: MONTHS_BACK,
+    }));
+  }
+  return results;
+}
+
+async function runBatchMatchesSingle() {
+  await withDatabase(async (pool) => {
+    const repaymentCategoryId = await getCategoryId(pool, 'Credit Card Repayment');
+    const feesCategoryId = await getCategoryId(pool, 'Bank & Card Fees');
+
+    await insertTransactions(pool, [
+      // Max card 1111: history starts inside the window; another max card is much older
+      { vendor: 'max', accountNumber: '9999', date: daysAgo(320), processedDate: daysAgo(300), name: 'Old purchase', price: -80 },
+      { vendor: 'max', accountNumber: '1111', date: daysAgo(55), processedDate: daysAgo(40), name: 'Groceries', price: -320 },
+      { vendor: 'max', accountNumber: '1111', date: daysAgo(50), processedDate: daysAgo(40), name: 'Fuel', price: -180 },
+      { vendor: 'max', accountNumber: '1111', date: daysAgo(45), processedDate: daysAgo(40), name: 'דמי כרטיס', price: -15, categoryId: feesCategoryId },
+      { vendor: 'max', accountNumber: '1111', date: daysAgo(20), processedDate: daysAgo(10), name: 'Pharmacy', price: -300 },
+      // Two isracard cards repaid from the same bank account (allocated)
+      { vendor: 'isracard', accountNumber: '2222', date: daysAgo(60), processedDate: daysAgo(40), name: 'Restaurant', price: -200 },
+      { vendor: 'isracard', accountNumber: '3333', date: daysAgo(58), processedDate: daysAgo(40), name: 'Electronics', price: -350 },
+      { vendor: 'isracard', accountNumber: '3333', date: daysAgo(25), processedDate: daysAgo(12), name: 'Books', price: -90 },
+      // Visa Cal card paired without an account number: history across two cards
+      { vendor: 'visaCal', accountNumber: '4444', date: daysAgo(35), processedDate: daysAgo(25), name: 'Clothes', price: -400 },
+      { vendor: 'visaCal', accountNumber: '5555', date: daysAgo(80), processedDate: daysAgo(70), name: 'Furniture', price: -900 },
+      { vendor: 'visaCal', accountNumber: '5555', date: daysAgo(30), processedDate: daysAgo(25), name: 'Refund', price: 50 },
+      // Bank repayments
+      { vendor: 'hapoalim', accountNumber: '123', date: daysAgo(40, '08:00:00'), name: 'מקס איט פיננסים 1111', price: -500, categoryId: repaymentCategoryId },
+      { vendor: 'hapoalim', accountNumber: '123', date: daysAgo(10, '08:00:00'), name: 'MAX 1111', price: -290, categoryId: repaymentCategoryId },
+      { vendor: 'hapoalim', accountNumber: '123', date: daysAgo(40, '09:00:00'), name: 'ישראכרט', price: -200, categoryId: repaymentCategoryId },
+      { vendor: 'hapoalim', accountNumber: '123', date: daysAgo(40, '10:00:00'), name: 'ישראכרט', price: -350, categoryId: repaymentCategoryId },
+      { vendor: 'hapoalim', accountNumber: '123', date: daysAgo(12, '10:00:00'), name: 'ישראכרט', price: -90, categoryId: repaymentCategoryId },
+      { vendor: 'hapoalim', accountNumber: '123', date: daysAgo(200, '08:00:00'), name: 'MAX 1111', price: -80, categoryId: repaymentCategoryId },
+      { vendor: 'hapoalim', accountNumber: '123', date: daysAgo(30, '08:00:00'), name: 'MAX 1111 not a repayment', price: -75 },
+      { vendor: 'leumi', accountNumber: '777', date: daysAgo(25, '08:00:00'), name: 'Visa Cal', price: -350, categoryId: repaymentCategoryId },
+      { vendor: 'leumi', accountNumber: '777', date: daysAgo(70, '08:00:00'), name: 'כ.א.ל', price: -1200, categoryId: repaymentCategoryId },
+    ]);
+
+    const pairings = await insertPairings(pool, [
+      { bankVendor: 'hapoalim', bankAccountNumber: '123', creditCardVendor: 'max', creditCardAccountNumber: '1111' },
+      { bankVendor: 'hapoalim', bankAccountNumber: '123', creditCardVendor: 'isracard', creditCardAccountNumber: '2222' },
+      { bankVendor: 'hapoalim', bankAccountNumber: '123', creditCardVendor: 'isracard', creditCardAccountNumber: '3333', acknowledged: true },
+      { bankVendor: 'leumi', bankAccountNumber: '777', creditCardVendor: 'visaCal', creditCardAccountNumber: null },
+      { bankVendor: 'leumi', bankAccountNumber: null, creditCardVendor: 'max', creditCardAccountNumber: '1111' },
+    ]);
+    const requested = [...pairings, null, { id: null, bankVendor: 'discount', creditCardVendor: 'amex' }];
+
+    const single = await calculateEachPairing(requested.map((pairing) => pairing || {}));
+    const batch = await autoPairingService.calculateDiscrepancies({ pairings: requested, monthsBack: MONTHS_BACK });
+
+    assert.deepEqual(batch, single);
+    assert.equal(batch[0].method, 'direct');
+    // The first cycle falls within the early grace window of this card's own history
+    assert.ok(batch[0].cycles.some((cycle) => cycle.status === 'incomplete_history'));
+    assert.equal(batch[1].method, 'allocated');
+    assert.equal(batch[2].acknowledged, true);
+    // Without a card account, the earliest cycle spans every card of the vendor
+    assert.ok(batch[3].cycles.some((cycle) => cycle.status === 'incomplete_history'));
+    assert.equal(batch[5], null);
+    assert.equal(batch[6].exists, false);
+  });
+}
+
+async function runRepaymentRowLimit() {
+  await withDatabase(async (pool) => {
+    const repaymentCategoryId = await getCategoryId(pool, 'Credit Card Repayment');
+    const rows = [];
+    // More matching repayments per card than one pairing reads, each with a distinct timestamp
+    for (let i = 0; i < 1040; i += 1) {
+      const minute = String(i % 60).padStart(2, '0');
+      const hour = String(Math.floor(i / 60)).padStart(2, '0');
+      rows.push({
+        vendor: 'hapoalim',
+        accountNumber: '123',
+        date: daysAgo(5 + (i % 60), `${hour}:${minute}:00`),
+        name: i % 2 === 0 ? 'MAX 1111' : 'ישראכרט 2222',
+        price: -(100 + i),
+        categoryId: repaymentCategoryId,
+      });
+    }
+    rows.push({ vendor: 'max', accountNumber: '1111', date: daysAgo(20), processedDate: daysAgo(10), name: 'Purchase', price: -100 });
+    await insertTransactions(pool, rows);
+
+    const pairings = await insertPairings(pool, [
+      { bankVendor: 'hapoalim', bankAccountNumber: '123', creditCardVendor: 'max', creditCardAccountNumber: '1111' },
+      { bankVendor: 'hapoalim', bankAccountNumber: '123', creditCardVendor: 'isracard', creditCardAccountNumber: '2222' },
+      { bankVendor: 'hapoalim', bankAccountNumber: null, creditCardVendor: 'isracard', creditCardAccountNumber: null },
+    ]);
+
+    const single = await calculateEachPairing(pairings);
+    const batch = await autoPairingService.calculateDiscrepancies({ pairings, monthsBack: MONTHS_BACK });
+
+    assert.deepEqual(batch, single);
+  });
+}
+
+async function main() {
+  const scenario = process.argv[2];
+  if (scenario === 'batch-matches-single') {
+    await runBatchMatchesSingle();
+  } else if (scenario === 'repayment-row-limit') {
+    await runRepaymentRowLimit();
+  } else {
+    throw new Error(`Unknown auto-pairing integration scenario: ${scenario}`);
+  }
+  process.stdout.write(`auto-pairing-integration:${scenario}:ok\n`);
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exitCode = 1;
+});
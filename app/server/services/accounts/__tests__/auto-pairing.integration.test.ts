@@ -0,0 +1,35 @@
+import path from 'path';
+import { spawnSync } from 'child_process';
+import { describe, expect, it } from 'vitest';
+
+// better-sqlite3 is rebuilt for Electron in this project, so real database
+// integration checks must run under Electron's Node ABI rather than Vitest's.
+// eslint-disable-next-line @typescript-eslint/no-var-requires
+const electronBinary = require('electron');
+const runnerPath = path.join(__dirname, 'auto-pairing.integration.runner.cjs');
+
+function runScenario(scenario: string) {
+  return spawnSync(electronBinary, [runnerPath, scenario], {
+    cwd: path.resolve(__dirname, '../../../../..'),
+    encoding: 'utf8',
+    env: {
+      ...process.env,
+      ELECTRON_RUN_AS_NODE: '1',
+    },
+    timeout: 30_000,
+  });
+}
+
+describe('auto-pairing batched discrepancies SQLite integration', () => {
+  it('matches per-pairing discrepancies, including pairings without a card account', () => {
+    const result = runScenario('batch-matches-single');
+    expect(result.status, result.stderr || result.stdout).toBe(0);
+    expect(result.stdout).toContain('auto-pairing-integration:batch-matches-single:ok');
+  });
+
+  it('trims each pairing to the same repayment rows as its own bounded query', () => {
+    const result = runScenario('repayment-row-limit');
+    expect(result.status, result.stderr || result.stdout).toBe(0);
+    expect(result.stdout).toContain('auto-pairing-integration:repayment-row-limit:ok');
+  });
+});
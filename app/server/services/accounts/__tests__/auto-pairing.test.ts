@@ -88,6 +88,16 @@ describe('auto-pairing service', () => {
       expect(internal.extractDigitSequences('no digits')).toEqual([]);
 
       expect(internal.nameContainsVendor('תשלום ישראכרט', 'isracard')).toBe(true);
+      expect(internal.nameContainsVendor('VISA CAL repayment', 'visaCal')).toBe(true);
+      expect(internal.nameContainsVendor('כXאXל', 'visaCal')).toBe(false);
+      expect(internal.getVendorPattern('isracard', '5678')).toBe(internal.getVendorPattern('isracard', '5678'));
+      expect(internal.getVendorPattern('isracard', '5678')?.test('חיוב 5678')).toBe(true);
+      expect(internal.getVendorPattern('unknown')).toBeNull();
+
+      expect(internal.toUtcDayNumber('1970-01-02')).toBe(1);
+      expect(internal.toUtcDayNumber('2025-01-05')).toBe(Date.UTC(2025, 0, 5) / 86400000);
+      expect(internal.toUtcDayNumber('not-a-date')).toBeNull();
+      expect(internal.toUtcDayNumber('2025-13-01')).toBeNull();
       expect(internal.detectCCVendorFromName('Monthly MAX charge')).toBe('max');
       expect(internal.detectCCVendorFromName('unknown')).toBeNull();
 
@@ -96,6 +106,83 @@ describe('auto-pairing service', () => {
       );
     });
 
+    it('caches the CC fees category id across lookups', async () => {
+      const internal = autoPairingService._internal;
+      mockClient.query.mockResolvedValueOnce({ rows: [{ id: 5 }] });
+
+      await expect(internal.getCCFeesCategoryId(mockClient)).resolves.toBe(5);
+      await expect(internal.getCCFeesCategoryId(mockClient)).resolves.toBe(5);
+      expect(mockClient.query).toHaveBeenCalledTimes(1);
+    });
+
+    it('does not cache a missing CC fees category id once categories are seeded', async () => {
+      const internal = autoPairingService._internal;
+      mockClient.query
+        .mockResolvedValueOnce({ rows: [] })
+        .mockResolvedValueOnce({ rows: [{ id: 7 }] });
+
+      await expect(internal.getCCFeesCategoryId(mockClient)).resolves.toBeNull();
+      await expect(internal.getCCFeesCategoryId(mockClient)).resolves.toBe(7);
+      expect(mockClient.query).toHaveBeenCalledTimes(2);
+    });
+
+    it('keeps the CC fees category id per database', async () => {
+      const internal = autoPairingService._internal;
+      mockClient.query
+        .mockResolvedValueOnce({ rows: [{ id: 5 }] })
+        .mockResolvedValueOnce({ rows: [{ id: 9 }] });
+
+      let currentPool = {};
+      autoPairingService.__setDatabase({ getClient: getClientMock, getPool: () => currentPool });
+
+      await expect(internal.getCCFeesCategoryId(mockClient)).resolves.toBe(5);
+      await expect(internal.getCCFeesCategoryId(mockClient)).resolves.toBe(5);
+      // Reopening the database swaps the pool without going through the test hooks
+      currentPool = {};
+      await expect(internal.getCCFeesCategoryId(mockClient)).resolves.toBe(9);
+      expect(mockClient.query).toHaveBeenCalledTimes(2);
+    });
+
+    it('caches the earliest CC cycle date per vendor and account', async () => {
+      const internal = autoPairingService._internal;
+      mockClient.query
+        .mockResolvedValueOnce({ rows: [{ min_date: '2024-10-01' }] })
+        .mockResolvedValueOnce({ rows: [{ min_date: '2024-11-01' }] });
+
+      const params = { ccVendor: 'isracard', ccAccountNumber: '5678', ccFeesCategoryId: 5 };
+      await expect(internal.getEarliestCCCycleDate(mockClient, params)).resolves.toBe('2024-10-01');
+      await expect(internal.getEarliestCCCycleDate(mockClient, params)).resolves.toBe('2024-10-01');
+      await expect(
+        internal.getEarliestCCCycleDate(mockClient, { ...params, ccAccountNumber: '9999' }),
+      ).resolves.toBe('2024-11-01');
+      expect(mockClient.query).toHaveBeenCalledTimes(2);
+    });
+
+    it('does not cache a missing earliest CC cycle date once history arrives', async () => {
+      const internal = autoPairingService._internal;
+      mockClient.query
+        .mockResolvedValueOnce({ rows: [{ min_date: null }] })
+        .mockResolvedValueOnce({ rows: [{ min_date: '2024-12-01' }] });
+
+      const params = { ccVendor: 'max', ccAccountNumber: '1111', ccFeesCategoryId: null };
+      await expect(internal.getEarliestCCCycleDate(mockClient, params)).resolves.toBeNull();
+      await expect(internal.getEarliestCCCycleDate(mockClient, params)).resolves.toBe('2024-12-01');
+      expect(mockClient.query).toHaveBeenCalledTimes(2);
+    });
+
+    it('re-reads the earliest CC cycle date after the cache is reset', async () => {
+      const internal = autoPairingService._internal;
+      mockClient.query
+        .mockResolvedValueOnce({ rows: [{ min_date: '2024-10-01' }] })
+        .mockResolvedValueOnce({ rows: [{ min_date: '2024-08-01' }] });
+
+      const params = { ccVendor: 'isracard', ccAccountNumber: '5678', ccFeesCategoryId: 5 };
+      await expect(internal.getEarliestCCCycleDate(mockClient, params)).resolves.toBe('2024-10-01');
+      autoPairingService.resetEarliestCCCycleDateCache();
+      await expect(internal.getEarliestCCCycleDate(mockClient, params)).resolves.toBe('2024-08-01');
+      expect(mockClient.query).toHaveBeenCalledTimes(2);
+    });
+
     it('applies pairing transaction updates only when repayment category id is available', async () => {
       const internal = autoPairingService._internal;
 
@@ -431,6 +518,8 @@ describe('auto-pairing service', () => {
         .mockResolvedValueOnce({ rows: [{ id: 5 }] })
         // Earliest CC cycle date (field is min_date)
         .mockResolvedValueOnce({ rows: [{ min_date: '2024-10-01' }] })
+        // account_pairings query (empty to skip allocation logic)
+        .mockResolvedValueOnce({ rows: [] })
         // Bank repayments (needs repayment_date field)
         .mockResolvedValueOnce({
           rows: [
@@ -445,12 +534,11 @@ describe('auto-pairing service', () => {
             },
           ],
         })
-        // account_pairings query (empty to skip allocation logic)
-        .mockResolvedValueOnce({ rows: [] })
-        // CC expenses for matching cycle (fields are account_number, total, txn_count)
+        // CC expenses grouped by cycle (fields are cycle_date, account_number, total, txn_count)
         .mockResolvedValueOnce({
           rows: [
             {
+              cycle_date: '2025-01-05',
               account_number: '5678',
               total: 1500,
               txn_count: 5,
@@ -470,12 +558,70 @@ describe('auto-pairing service', () => {
       expect(mockClient.release).toHaveBeenCalled();
     });
 
+    it('fetches CC totals for all repayment cycles with a single grouped query', async () => {
+      mockClient.query
+        .mockResolvedValueOnce({ rows: [{ id: 5 }] })
+        .mockResolvedValueOnce({ rows: [{ min_date: '2024-10-01' }] })
+        .mockResolvedValueOnce({
+          rows: [
+            {
+              identifier: 'bank-feb',
+              vendor: 'hapoalim',
+              name: 'ישראכרט 5678',
+              price: -800,
+              date: '2025-02-05',
+              repayment_date: '2025-02-05',
+              account_number: '9876',
+            },
+            {
+              identifier: 'bank-jan',
+              vendor: 'hapoalim',
+              name: 'ישראכרט 5678',
+              price: -1500,
+              date: '2025-01-05',
+              repayment_date: '2025-01-05',
+              account_number: '9876',
+            },
+          ],
+        })
+        .mockResolvedValueOnce({ rows: [] })
+        .mockResolvedValueOnce({
+          rows: [
+            { cycle_date: '2025-01-05', account_number: '5678', total: 1500, txn_count: 4 },
+            { cycle_date: '2025-02-05', account_number: '5678', total: 800, txn_count: 2 },
+          ],
+        });
+
+      const result = await autoPairingService.calculateDiscrepancy({
+        bankVendor: 'hapoalim',
+        bankAccountNumber: '9876',
+        ccVendor: 'isracard',
+        ccAccountNumber: '5678',
+      });
+
+      expect(mockClient.query).toHaveBeenCalledTimes(5);
+      const [ccSql, ccParams] = mockClient.query.mock.calls[4];
+      expect(ccSql).toContain('GROUP BY substr(COALESCE(t.processed_date, t.date), 1, 10), t.account_number');
+      expect(ccParams).toEqual(['isracard', '2025-01-05', '2025-02-05', 5, '5678']);
+      expect(result.cycles.map((cycle: any) => [cycle.cycleDate, cycle.status])).toEqual([
+        ['2025-02-05', 'matched'],
+        ['2025-01-05', 'matched'],
+      ]);
+    });
+
     it('uses allocated matching when multiple same-vendor cards share a bank account', async () => {
       mockClient.query
         // CC fees category
         .mockResolvedValueOnce({ rows: [{ id: 5 }] })
         // Earliest CC cycle
         .mockResolvedValueOnce({ rows: [{ min_date: '2024-10-01' }] })
+        // Active pairings for same bank/vendor with 2 different CC accounts
+        .mockResolvedValueOnce({
+          rows: [
+            { credit_card_account_number: '5678' },
+            { credit_card_account_number: '9999' },
+          ],
+        })
         // Bank repayments for shared account/date
         .mockResolvedValueOnce({
           rows: [
@@ -499,25 +645,12 @@ describe('auto-pairing service', () => {
             },
           ],
         })
-        // Active pairings for same bank/vendor with 2 different CC accounts
-        .mockResolvedValueOnce({
-          rows: [
-            { credit_card_account_number: '5678' },
-            { credit_card_account_number: '9999' },
-          ],
-        })
-        // CC totals by account/date (used by allocation)
+        // CC totals by account/date (used by allocation and reused for the cycle summary)
         .mockResolvedValueOnce({
           rows: [
             { account_number: '5678', cycle_date: '2025-01-05', total: 1000 },
             { account_number: '9999', cycle_date: '2025-01-05', total: 500 },
           ],
-        })
-        // Per-cycle CC comparison for target account
-        .mockResolvedValueOnce({
-          rows: [
-            { account_number: '5678', total: 1000, txn_count: 2 },
-          ],
         });
 
       const result = await autoPairingService.calculateDiscrepancy({
@@ -532,6 +665,8 @@ describe('auto-pairing service', () => {
       expect(result.method).toBe('allocated');
       expect(result.totalCycles).toBeGreaterThan(0);
       expect(result.matchedCycleCount).toBeGreaterThanOrEqual(1);
+      expect(result.cycles[0]).toMatchObject({ ccTotal: 1000, matchedAccount: '5678' });
+      expect(mockClient.query).toHaveBeenCalledTimes(5);
     });
 
     it('includes acknowledged flag from pairing', async () => {
@@ -554,27 +689,36 @@ describe('auto-pairing service', () => {
       expect(result?.acknowledged).toBe(true);
     });
 
+    it('skips the acknowledged lookup when the caller provides the flag', async () => {
+      mockClient.query
+        // CC fees category
+        .mockResolvedValueOnce({ rows: [] })
+        // Earliest date
+        .mockResolvedValueOnce({ rows: [] })
+        // Bank repayments
+        .mockResolvedValueOnce({ rows: [] });
+
+      const result = await autoPairingService.calculateDiscrepancy({
+        pairingId: 1,
+        bankVendor: 'hapoalim',
+        ccVendor: 'isracard',
+        discrepancyAcknowledged: true,
+      });
+
+      expect(result?.acknowledged).toBe(true);
+      expect(mockClient.query).toHaveBeenCalledTimes(3);
+      expect(mockClient.query.mock.calls.some(([sql]) => String(sql).includes('SELECT discrepancy_acknowledged'))).toBe(false);
+    });
+
     it('returns exists: false when no matching repayments found', async () => {
       mockClient.query
         // CC fees category
         .mockResolvedValueOnce({ rows: [{ id: 5 }] })
         // Earliest date
         .mockResolvedValueOnce({ rows: [{ min_date: '2024-10-01' }] })
-        // Bank repayments (no matches for this CC)
-        .mockResolvedValueOnce({
-          rows: [
-            {
-              identifier: 'bank-1',
-              vendor: 'hapoalim',
-              name: 'Generic payment',
-              price: -1500,
-              date: '2025-01-05',
-              repayment_date: '2025-01-05',
-              account_number: '9876',
-            },
-          ],
-        })
         // account_pairings query
+        .mockResolvedValueOnce({ rows: [] })
+        // Bank repayments (name filter in SQL leaves no matches for this CC)
         .mockResolvedValueOnce({ rows: [] });
 
       const result = await autoPairingService.calculateDiscrepancy({
@@ -588,6 +732,12 @@ describe('auto-pairing service', () => {
       expect(result).toBeDefined();
       expect(result.exists).toBe(false);
       expect(result.reason).toContain('No bank repayments found matching');
+
+      const [bankSql, bankParams] = mockClient.query.mock.calls[3];
+      expect(bankSql).toContain("LIKE '%' ||");
+      expect(bankParams).toEqual(
+        expect.arrayContaining(['hapoalim', '9876', 'ישראכרט', 'isracard', '5678']),
+      );
     });
 
     it('handles missing ccFeesCategoryId gracefully', async () => {
@@ -644,6 +794,8 @@ describe('auto-pairing service', () => {
         .mockResolvedValueOnce({ rows: [{ id: 5 }] })
         // Earliest cycle date
         .mockResolvedValueOnce({ rows: [{ min_date: '2026-02-01' }] })
+        // account_pairings lookup
+        .mockResolvedValueOnce({ rows: [] })
         // Bank repayments
         .mockResolvedValueOnce({
           rows: [
@@ -658,8 +810,6 @@ describe('auto-pairing service', () => {
             },
           ],
         })
-        // account_pairings lookup
-        .mockResolvedValueOnce({ rows: [] })
         // CC cycle rows -> force missing_cc_cycle
         .mockResolvedValueOnce({ rows: [] });
 
@@ -684,6 +834,8 @@ describe('auto-pairing service', () => {
         .mockResolvedValueOnce({ rows: [{ id: 5 }] })
         // Earliest cycle date missing
         .mockResolvedValueOnce({ rows: [{}] })
+        // account_pairings lookup
+        .mockResolvedValueOnce({ rows: [] })
         // Bank repayments
         .mockResolvedValueOnce({
           rows: [
@@ -698,8 +850,6 @@ describe('auto-pairing service', () => {
             },
           ],
         })
-        // account_pairings lookup
-        .mockResolvedValueOnce({ rows: [] })
         // CC cycle rows -> force missing_cc_cycle
         .mockResolvedValueOnce({ rows: [] });
 
@@ -724,6 +874,8 @@ describe('auto-pairing service', () => {
         .mockResolvedValueOnce({ rows: [{ id: 5 }] })
         // Earliest cycle date missing
         .mockResolvedValueOnce({ rows: [{}] })
+        // account_pairings lookup
+        .mockResolvedValueOnce({ rows: [] })
         // Bank repayments
         .mockResolvedValueOnce({
           rows: [
@@ -738,11 +890,9 @@ describe('auto-pairing service', () => {
             },
           ],
         })
-        // account_pairings lookup
-        .mockResolvedValueOnce({ rows: [] })
         // CC cycle rows
         .mockResolvedValueOnce({
-          rows: [{ account_number: '5678', total: 100, txn_count: 1 }],
+          rows: [{ cycle_date: '2025-12-06', account_number: '5678', total: 100, txn_count: 1 }],
         });
 
       const result = await autoPairingService.calculateDiscrepancy({
@@ -766,6 +916,8 @@ describe('auto-pairing service', () => {
         .mockResolvedValueOnce({ rows: [{ id: 5 }] })
         // Earliest cycle date missing
         .mockResolvedValueOnce({ rows: [{}] })
+        // account_pairings lookup
+        .mockResolvedValueOnce({ rows: [] })
         // Bank repayments
         .mockResolvedValueOnce({
           rows: [
@@ -780,11 +932,9 @@ describe('auto-pairing service', () => {
             },
           ],
         })
-        // account_pairings lookup
-        .mockResolvedValueOnce({ rows: [] })
         // CC cycle rows
         .mockResolvedValueOnce({
-          rows: [{ account_number: '5678', total: 1300, txn_count: 1 }],
+          rows: [{ cycle_date: '2025-12-07', account_number: '5678', total: 1300, txn_count: 1 }],
         });
 
       const result = await autoPairingService.calculateDiscrepancy({
@@ -805,6 +955,8 @@ describe('auto-pairing service', () => {
         .mockResolvedValueOnce({ rows: [{ id: 5 }] })
         // Earliest cycle date missing
         .mockResolvedValueOnce({ rows: [{}] })
+        // account_pairings lookup
+        .mockResolvedValueOnce({ rows: [] })
         // Bank repayments with invalid cycle date key
         .mockResolvedValueOnce({
           rows: [
@@ -819,8 +971,6 @@ describe('auto-pairing service', () => {
             },
           ],
         })
-        // account_pairings lookup
-        .mockResolvedValueOnce({ rows: [] })
         // CC cycle rows missing
         .mockResolvedValueOnce({ rows: [] });
 
@@ -841,6 +991,13 @@ describe('auto-pairing service', () => {
         .mockResolvedValueOnce({ rows: [{ id: 5 }] })
         // Earliest cycle date
         .mockResolvedValueOnce({ rows: [{ min_date: '2025-01-01' }] })
+        // Active pairings for same bank/vendor with 2 CC accounts
+        .mockResolvedValueOnce({
+          rows: [
+            { credit_card_account_number: '5678' },
+            { credit_card_account_number: '9999' },
+          ],
+        })
         // Bank repayments
         .mockResolvedValueOnce({
           rows: [
@@ -855,13 +1012,6 @@ describe('auto-pairing service', () => {
             },
           ],
         })
-        // Active pairings for same bank/vendor with 2 CC accounts
-        .mockResolvedValueOnce({
-          rows: [
-            { credit_card_account_number: '5678' },
-            { credit_card_account_number: '9999' },
-          ],
-        })
         // CC totals by account/date missing -> bestAccount remains null for no-signal repayments
         .mockResolvedValueOnce({ rows: [] });
 
@@ -885,6 +1035,13 @@ describe('auto-pairing service', () => {
         .mockResolvedValueOnce({ rows: [{ id: 5 }] })
         // Earliest cycle date
         .mockResolvedValueOnce({ rows: [{ min_date: '2025-01-01' }] })
+        // Active pairings for same bank/vendor with 2 CC accounts
+        .mockResolvedValueOnce({
+          rows: [
+            { credit_card_account_number: '5678' },
+            { credit_card_account_number: '9999' },
+          ],
+        })
         // Bank repayments
         .mockResolvedValueOnce({
           rows: [
@@ -899,13 +1056,6 @@ describe('auto-pairing service', () => {
             },
           ],
         })
-        // Active pairings for same bank/vendor with 2 CC accounts
-        .mockResolvedValueOnce({
-          rows: [
-            { credit_card_account_number: '5678' },
-            { credit_card_account_number: '9999' },
-          ],
-        })
         // CC totals by account/date exist, but still far from repayment amount
         .mockResolvedValueOnce({
           rows: [
@@ -929,6 +1079,73 @@ describe('auto-pairing service', () => {
     });
   });
 
+  describe('calculateDiscrepancies', () => {
+    it('computes every pairing from one batch of queries', async () => {
+      vi.useFakeTimers();
+      vi.setSystemTime(new Date('2026-03-20T00:00:00.000Z'));
+
+      mockClient.query.mockImplementation(async (sql: string) => {
+        const normalized = String(sql);
+        if (normalized.includes('FROM account_pairings')) {
+          return {
+            rows: [
+              { id: 1, bank_vendor: 'hapoalim', bank_account_number: '9876', credit_card_vendor: 'isracard', credit_card_account_number: '5678', is_active: 1, discrepancy_acknowledged: 0 },
+              { id: 2, bank_vendor: 'leumi', bank_account_number: '1111', credit_card_vendor: 'max', credit_card_account_number: '4321', is_active: 1, discrepancy_acknowledged: 1 },
+            ],
+          };
+        }
+        if (normalized.includes('FROM category_definitions')) {
+          return { rows: [{ id: 5 }] };
+        }
+        if (normalized.includes('MIN(substr(')) {
+          return {
+            rows: [
+              { vendor: 'isracard', account_number: '5678', min_date: '2025-01-01' },
+              { vendor: 'max', account_number: '4321', min_date: '2025-01-01' },
+            ],
+          };
+        }
+        if (normalized.includes('repayment_date')) {
+          return {
+            rows: [
+              { identifier: 'b-1', vendor: 'hapoalim', account_number: '9876', date: '2026-02-02', repayment_date: '2026-02-02', name: 'ישראכרט 5678', price: -1000 },
+              { identifier: 'b-2', vendor: 'hapoalim', account_number: '9876', date: '2026-02-01', repayment_date: '2026-02-01', name: 'monthly transfer', price: -50 },
+              { identifier: 'b-3', vendor: 'leumi', account_number: '1111', date: '2026-02-10', repayment_date: '2026-02-10', name: 'מקס איט', price: -700 },
+            ],
+          };
+        }
+        if (normalized.includes('AS cycle_date')) {
+          return {
+            rows: [
+              { vendor: 'isracard', cycle_date: '2026-02-02', account_number: '5678', total: 1000, txn_count: 3 },
+              { vendor: 'max', cycle_date: '2026-02-10', account_number: '4321', total: 400, txn_count: 2 },
+            ],
+          };
+        }
+        return { rows: [] };
+      });
+
+      const results = await autoPairingService.calculateDiscrepancies({
+        pairings: [
+          { id: 1, bankVendor: 'hapoalim', bankAccountNumber: '9876', creditCardVendor: 'isracard', creditCardAccountNumber: '5678' },
+          { id: 2, bankVendor: 'leumi', bankAccountNumber: '1111', creditCardVendor: 'max', creditCardAccountNumber: '4321' },
+          { id: 3, bankVendor: null, creditCardVendor: 'max' },
+        ],
+        monthsBack: 2,
+      });
+
+      expect(mockClient.query).toHaveBeenCalledTimes(5);
+      expect(mockClient.release).toHaveBeenCalledTimes(1);
+      expect(results).toHaveLength(3);
+      expect(results[0]).toMatchObject({ exists: false, acknowledged: false, method: 'direct', totalCycles: 1 });
+      expect(results[0].cycles[0]).toMatchObject({ cycleDate: '2026-02-02', status: 'matched', bankTotal: 1000 });
+      expect(results[1]).toMatchObject({ exists: false, acknowledged: true });
+      expect(results[1].cycles[0]).toMatchObject({ cycleDate: '2026-02-10', status: 'large_discrepancy', difference: 300 });
+      expect(results[2]).toBeNull();
+      vi.useRealTimers();
+    });
+  });
+
   describe('autoPairCreditCard', () => {
     it('throws 400 when creditCardVendor is missing', async () => {
       await expect(
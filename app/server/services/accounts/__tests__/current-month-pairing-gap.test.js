@@ -12,7 +12,7 @@ describe('current month pairing gap service', () => {
     listPairings: vi.fn(),
   };
   const autoPairingMock = {
-    calculateDiscrepancy: vi.fn(),
+    calculateDiscrepancies: vi.fn(),
   };
 
   beforeEach(() => {
@@ -20,7 +20,7 @@ describe('current month pairing gap service', () => {
     vi.setSystemTime(new Date('2026-03-08T12:00:00.000Z'));
 
     pairingsMock.listPairings.mockReset();
-    autoPairingMock.calculateDiscrepancy.mockReset();
+    autoPairingMock.calculateDiscrepancies.mockReset();
 
     currentMonthPairingGapService.__setDependencies({
       pairings: pairingsMock,
@@ -49,7 +49,7 @@ describe('current month pairing gap service', () => {
       affectedCyclesCount: 0,
     });
     expect(result.pairings).toEqual([]);
-    expect(autoPairingMock.calculateDiscrepancy).not.toHaveBeenCalled();
+    expect(autoPairingMock.calculateDiscrepancies).not.toHaveBeenCalled();
   });
 
   it('counts positive gaps and treats null cc totals as fully missing', async () => {
@@ -63,13 +63,13 @@ describe('current month pairing gap service', () => {
       },
     ]);
 
-    autoPairingMock.calculateDiscrepancy.mockResolvedValue({
+    autoPairingMock.calculateDiscrepancies.mockResolvedValue([{
       cycles: [
         { cycleDate: '2026-03-07', bankTotal: 1000, ccTotal: 900, status: 'large_discrepancy' },
         { cycleDate: '2026-03-01', bankTotal: 500, ccTotal: null, status: 'missing_cc_cycle' },
         { cycleDate: '2026-02-10', bankTotal: 300, ccTotal: 300, status: 'matched' },
       ],
-    });
+    }]);
 
     const result = await currentMonthPairingGapService.getCurrentMonthPairingGap();
 
@@ -80,6 +80,11 @@ describe('current month pairing gap service', () => {
       affectedPairingsCount: 1,
       affectedCyclesCount: 2,
     });
+    expect(autoPairingMock.calculateDiscrepancies).toHaveBeenCalledTimes(1);
+    expect(autoPairingMock.calculateDiscrepancies).toHaveBeenCalledWith({
+      pairings: [expect.objectContaining({ id: 5 })],
+      monthsBack: 2,
+    });
     expect(result.pairings).toHaveLength(1);
     expect(result.pairings[0]).toMatchObject({
       pairingId: 5,
@@ -117,13 +122,13 @@ describe('current month pairing gap service', () => {
       },
     ]);
 
-    autoPairingMock.calculateDiscrepancy.mockResolvedValue({
+    autoPairingMock.calculateDiscrepancies.mockResolvedValue([{
       cycles: [
         { cycleDate: '2026-03-06', bankTotal: 100, ccTotal: 120, status: 'cc_over_bank' }, // negative gap
         { cycleDate: '2026-03-05', bankTotal: 100, ccTotal: 98.5, status: 'fee_candidate' }, // <= tolerance
         { cycleDate: '2026-01-31', bankTotal: 300, ccTotal: 0, status: 'missing_cc_cycle' }, // outside window
       ],
-    });
+    }]);
 
     const result = await currentMonthPairingGapService.getCurrentMonthPairingGap();
 
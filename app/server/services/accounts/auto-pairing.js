@@ -15,6 +15,10 @@ const VENDOR_KEYWORDS = {
   diners: ['דיינרס', 'diners'],
 };
 
+// Constant CC vendor exclusion list, built once so the bank-search SQL text stays stable
+const CC_VENDOR_CODES = Object.keys(VENDOR_KEYWORDS);
+const CC_VENDOR_PLACEHOLDERS = CC_VENDOR_CODES.map((_, i) => `$${i + 1}`).join(', ');
+
 function containsInsensitive(column, placeholder) {
   if (dialect.useSqlite) {
     return `${column} LIKE '%' || ${placeholder} || '%'`;
@@ -22,7 +26,29 @@ function containsInsensitive(column, placeholder) {
   return `LOWER(${column}) LIKE '%' || LOWER(${placeholder}) || '%'`;
 }
 
+// Fees category id per open database (keyed on its pool), so a reopened or swapped
+// database never serves another file's id. A missing row is never cached, so the
+// lookup retries once categories are seeded; category writes clear the cache.
+let ccFeesCategoryCache = new WeakMap();
+const CC_FEES_CATEGORY_CACHE_TTL = 5 * 60 * 1000; // 5 minutes
+
+function resetCCFeesCategoryCache() {
+  ccFeesCategoryCache = new WeakMap();
+}
+
+function getDatabaseCacheOwner() {
+  const db = getDatabase();
+  return typeof db.getPool === 'function' ? db.getPool() : db;
+}
+
 async function getCCFeesCategoryId(client) {
+  const cacheOwner = getDatabaseCacheOwner();
+  const now = Date.now();
+  const cached = ccFeesCategoryCache.get(cacheOwner);
+  if (cached && (now - cached.timestamp) < CC_FEES_CATEGORY_CACHE_TTL) {
+    return cached.value;
+  }
+
   try {
     const result = await client.query(`
       SELECT id FROM category_definitions
@@ -30,7 +56,66 @@ async function getCCFeesCategoryId(client) {
          OR name = 'עמלות בנק וכרטיס'
       LIMIT 1
     `);
-    return result.rows?.[0]?.id ?? null;
+    const value = result.rows?.[0]?.id ?? null;
+    if (value !== null) {
+      ccFeesCategoryCache.set(cacheOwner, { value, timestamp: now });
+    }
+    return value;
+  } catch (_error) {
+    return null;
+  }
+}
+
+// Earliest CC history per (vendor, account, fees category); only moves when older
+// history is imported, so repeated views of the same pairing reuse it. Cards with no
+// history yet are never cached, and every transaction write path (scrapes, manual
+// edits, recategorization, credential deletes) clears the cache.
+const earliestCCCycleDateCache = new Map();
+const EARLIEST_CC_CYCLE_CACHE_TTL = 5 * 60 * 1000; // 5 minutes
+
+function resetEarliestCCCycleDateCache() {
+  earliestCCCycleDateCache.clear();
+}
+
+async function getEarliestCCCycleDate(client, { ccVendor, ccAccountNumber, ccFeesCategoryId }) {
+  const cacheKey = `${ccVendor}|${ccAccountNumber || ''}|${ccFeesCategoryId || ''}`;
+  const now = Date.now();
+  const cached = earliestCCCycleDateCache.get(cacheKey);
+  if (cached && (now - cached.timestamp) < EARLIEST_CC_CYCLE_CACHE_TTL) {
+    return cached.value;
+  }
+
+  try {
+    const earliestParams = [ccVendor];
+    let earliestAccountFilter = '';
+    if (ccAccountNumber) {
+      earliestParams.push(ccAccountNumber);
+      earliestAccountFilter = `AND t.account_number = $${earliestParams.length}`;
+    }
+
+    let earliestFeesFilter = '';
+    if (ccFeesCategoryId) {
+      earliestParams.push(ccFeesCategoryId);
+      earliestFeesFilter = `AND (t.category_definition_id IS NULL OR t.category_definition_id <> $${earliestParams.length})`;
+    }
+
+    const earliestRow = (await client.query(
+      `
+        SELECT MIN(substr(COALESCE(t.processed_date, t.date), 1, 10)) AS min_date
+        FROM transactions t
+        WHERE t.vendor = $1
+          AND t.status = 'completed'
+          AND t.price < 0
+          ${earliestAccountFilter}
+          ${earliestFeesFilter}
+      `,
+      earliestParams,
+    )).rows?.[0];
+    const value = earliestRow?.min_date || null;
+    if (value) {
+      earliestCCCycleDateCache.set(cacheKey, { value, timestamp: now });
+    }
+    return value;
   } catch (_error) {
     return null;
   }
@@ -48,39 +133,80 @@ function getAccountLast4(accountNumber) {
 
 /**
  * Extract all 4-digit sequences from a string
+ *
+ * Single pass over the char codes (no regex/match array); for longer
+ * sequences, also extract the last 4 digits
  */
 function extractDigitSequences(text) {
   if (!text) return [];
-  const matches = text.match(/\d{4,}/g) || [];
-  // For longer sequences, also extract the last 4 digits
   const result = new Set();
-  matches.forEach(m => {
-    result.add(m);
-    if (m.length > 4) {
-      result.add(m.slice(-4));
+  let runStart = -1;
+  for (let i = 0; i <= text.length; i += 1) {
+    const code = i < text.length ? text.charCodeAt(i) : -1;
+    if (code >= 48 && code <= 57) {
+      if (runStart < 0) runStart = i;
+      continue;
     }
-  });
+    if (runStart >= 0 && i - runStart >= 4) {
+      const sequence = text.slice(runStart, i);
+      result.add(sequence);
+      if (sequence.length > 4) {
+        result.add(sequence.slice(-4));
+      }
+    }
+    runStart = -1;
+  }
   return Array.from(result);
 }
 
+function escapeRegExp(value) {
+  return String(value).replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+}
+
+const vendorPatternCache = new Map();
+
+/**
+ * Build (once per vendor/last-4 pair) a case-insensitive alternation regex
+ * matching any of the vendor keywords, plus the card's last-4 digits if given.
+ */
+function getVendorPattern(ccVendor, last4 = null) {
+  const cacheKey = `${ccVendor}|${last4 || ''}`;
+  if (vendorPatternCache.has(cacheKey)) {
+    return vendorPatternCache.get(cacheKey);
+  }
+
+  const terms = [...(VENDOR_KEYWORDS[ccVendor] || [])];
+  if (last4) {
+    terms.push(last4);
+  }
+  const pattern = terms.length > 0
+    ? new RegExp(terms.map(escapeRegExp).join('|'), 'i')
+    : null;
+  vendorPatternCache.set(cacheKey, pattern);
+  return pattern;
+}
+
 /**
  * Check if a transaction name contains any vendor keywords for the given CC vendor
  */
 function nameContainsVendor(name, ccVendor) {
   if (!name || !ccVendor) return false;
-  const nameLower = name.toLowerCase();
-  const keywords = VENDOR_KEYWORDS[ccVendor] || [];
-  return keywords.some(kw => nameLower.includes(kw.toLowerCase()));
+  const pattern = getVendorPattern(ccVendor);
+  return pattern ? pattern.test(name) : false;
 }
 
+// Every CC vendor keyword in one regex, so names that mention no card vendor
+// (the common case) are rejected in a single scan instead of one per vendor
+const ANY_CC_VENDOR_PATTERN = new RegExp(
+  CC_VENDOR_CODES.flatMap((vendor) => VENDOR_KEYWORDS[vendor]).map(escapeRegExp).join('|'),
+  'i',
+);
+
 function detectCCVendorFromName(name) {
-  if (!name) return null;
-  const nameLower = name.toLowerCase();
-  for (const [vendor, keywords] of Object.entries(VENDOR_KEYWORDS)) {
-    for (const kw of keywords) {
-      if (nameLower.includes(String(kw).toLowerCase())) {
-        return vendor;
-      }
+  if (!name || !ANY_CC_VENDOR_PATTERN.test(name)) return null;
+  for (const vendor of CC_VENDOR_CODES) {
+    if (getVendorPattern(vendor).test(name)) {
+      return vendor;
     }
   }
   return null;
@@ -132,10 +258,6 @@ async function findBestBankAccount(params) {
   try {
     const ccLast4 = getAccountLast4(creditCardAccountNumber);
 
-    // Exclude CC vendors from bank search
-    const ccVendors = Object.keys(VENDOR_KEYWORDS);
-    const ccVendorPlaceholders = ccVendors.map((_, i) => `$${i + 1}`).join(', ');
-
     const repaymentCategoryCondition = repaymentCategoryRef.getCreditCardRepaymentCategoryCondition('cd');
 
     // Find all bank repayment transactions (by category only)
@@ -149,14 +271,14 @@ async function findBestBankAccount(params) {
         t.date
       FROM transactions t
       LEFT JOIN category_definitions cd ON cd.id = t.category_definition_id
-      WHERE t.vendor NOT IN (${ccVendorPlaceholders})
+      WHERE t.vendor NOT IN (${CC_VENDOR_PLACEHOLDERS})
         AND t.price < 0
         AND ${repaymentCategoryCondition}
       ORDER BY t.date DESC
       LIMIT 500
     `;
 
-    const result = await client.query(query, ccVendors);
+    const result = await client.query(query, CC_VENDOR_CODES);
 
     if (result.rows.length === 0) {
       return { found: false, reason: 'No bank repayment transactions found' 
@@ -174,6 +296,8 @@ async function findBestBankAccount(params) {
           bankVendor: row.vendor,
           bankAccountNumber: row.account_number,
           transactions: [],
+          // Rows that reference this CC, kept in order for the sample list
+          matchingTransactions: [],
           matchingLast4Count: 0,
           matchingVendorCount: 0,
         
@@ -193,6 +317,9 @@ async function findBestBankAccount(params) {
       if (nameHasVendor) {
         group.matchingVendorCount++;
       }
+      if (nameContainsCC || nameHasVendor) {
+        group.matchingTransactions.push(row);
+      }
     });
 
     // Find best match
@@ -227,12 +354,7 @@ async function findBestBankAccount(params) {
       matchingLast4Count: bestMatch.matchingLast4Count,
       matchingVendorCount: bestMatch.matchingVendorCount,
       matchPatterns,
-      sampleTransactions: bestMatch.transactions
-        .filter(t => {
-          const hasLast4 = ccLast4 && t.name && t.name.includes(ccLast4);
-          const hasVendor = nameContainsVendor(t.name, creditCardVendor);
-          return hasLast4 || hasVendor;
-        })
+      sampleTransactions: bestMatch.matchingTransactions
         .slice(0, 3)
         .map(t => ({
           name: t.name,
@@ -251,6 +373,413 @@ async function findBestBankAccount(params) {
   }
 }
 
+const EPSILON = 1.0; // Allow 1 ILS tolerance for rounding
+const MAX_FEE_AMOUNT = 200;
+const MAX_BANK_REPAYMENT_ROWS = 500;
+// Cycles this close to the earliest CC history or to today are incomplete, not discrepancies
+const EARLY_GRACE_DAYS = 14;
+const RECENT_GRACE_DAYS = 14;
+const ACTIONABLE_STATUSES = new Set(['fee_candidate', 'large_discrepancy', 'cc_over_bank', 'missing_cc_cycle']);
+
+const MS_PER_DAY = 24 * 60 * 60 * 1000;
+const DATE10_PATTERN = /^(\d{4})-(\d{2})-(\d{2})$/;
+
+/**
+ * Convert a YYYY-MM-DD key (as produced by substr(..., 1, 10)) to a UTC day number,
+ * or null when it is not a valid date key
+ */
+function toUtcDayNumber(dateKey) {
+  const match = DATE10_PATTERN.exec(dateKey || '');
+  if (!match) return null;
+  const month = Number(match[2]);
+  const day = Number(match[3]);
+  if (month < 1 || month > 12 || day < 1 || day > 31) return null;
+  return new Date(0).setUTCFullYear(Number(match[1]), month - 1, day) / MS_PER_DAY;
+}
+
+function getDiscrepancyWindow(monthsBack) {
+  const todayStr = new Date().toISOString().split('T')[0];
+  const startDate = new Date();
+  startDate.setMonth(startDate.getMonth() - monthsBack);
+  return {
+    todayStr,
+    startDateStr: startDate.toISOString().split('T')[0],
+    // Exclusive upper bound for raw t.date range predicates (day after today)
+    endExclusiveStr: new Date((toUtcDayNumber(todayStr) + 1) * MS_PER_DAY).toISOString().split('T')[0],
+  };
+}
+
+const ccCycleTotalExpressionCache = new Map();
+
+/**
+ * SUM expression for a CC cycle total: expenses count positive, fee waivers
+ * ("דמי כרטיס" with "פטור"/"הנחה" in the fees category) are subtracted.
+ * Cheap column checks come first so the LIKE scans only run on fee rows; the
+ * Hebrew patterns have no case, so the name is matched without lower()/COALESCE.
+ */
+function buildCCCycleTotalExpression(feesCategoryPlaceholder) {
+  if (ccCycleTotalExpressionCache.has(feesCategoryPlaceholder)) {
+    return ccCycleTotalExpressionCache.get(feesCategoryPlaceholder);
+  }
+
+  const expression = `COALESCE(SUM(
+    CASE
+      WHEN t.category_definition_id = ${feesCategoryPlaceholder}
+        AND t.price < 0
+        AND t.name LIKE '%דמי כרטיס%'
+        AND (t.name LIKE '%פטור%' OR t.name LIKE '%הנחה%')
+        THEN t.price
+      ELSE -t.price
+    END
+  ), 0)`;
+  ccCycleTotalExpressionCache.set(feesCategoryPlaceholder, expression);
+  return expression;
+}
+
+function buildGroupAccounts(creditCardAccountNumbers, ccAccountNumber) {
+  return Array.from(new Set(
+    creditCardAccountNumbers
+      .filter(Boolean)
+      .concat([ccAccountNumber]),
+  ));
+}
+
+function buildCCTotalsByAccount(rows) {
+  const ccTotalsByAccount = new Map();
+  for (const row of rows) {
+    const acct = row.account_number;
+    const dateKey = row.cycle_date;
+    const total = Math.max(0, Number.parseFloat(row.total) || 0);
+    if (!acct || !dateKey) continue;
+    if (!ccTotalsByAccount.has(acct)) {
+      ccTotalsByAccount.set(acct, new Map());
+    }
+    ccTotalsByAccount.get(acct).set(dateKey, total);
+  }
+  return ccTotalsByAccount;
+}
+
+/**
+ * Bucket grouped CC rows by cycle date as [accountNumber, total] pairs, reading
+ * and parsing each row's columns once instead of on every classification scan
+ */
+function groupCCTotalsByDate(rows, ccAccountNumber) {
+  const ccTotalsByDate = new Map();
+  for (const row of rows) {
+    const accountNumber = row.account_number;
+    if (ccAccountNumber && accountNumber !== ccAccountNumber) continue;
+    const dateKey = row.cycle_date;
+    let bucket = ccTotalsByDate.get(dateKey);
+    if (!bucket) {
+      bucket = [];
+      ccTotalsByDate.set(dateKey, bucket);
+    }
+    bucket.push([accountNumber, Math.max(0, Number.parseFloat(row.total) || 0)]);
+  }
+  return ccTotalsByDate;
+}
+
+/**
+ * Allocate a shared bank account's repayments across the same-vendor cards paired
+ * with it, returning a Map of group account -> assigned rows. The assignment does
+ * not depend on which card asks, so every card in the group can share one run.
+ */
+function allocateSharedRepayments({
+  repaymentRows,
+  groupAccounts,
+  ccVendor,
+  ccTotalsByAccount,
+}) {
+  // Parallel arrays (amounts, names) indexed by row position; dates bucket row
+  // indexes, and rows are only touched again when an assignment is emitted
+  const amounts = new Float64Array(repaymentRows.length);
+  const names = new Array(repaymentRows.length);
+  const rowIndexesByDate = new Map();
+  repaymentRows.forEach((row, rowIndex) => {
+    const dateKey = row.repayment_date;
+    if (!dateKey) return;
+    amounts[rowIndex] = Math.abs(Number.parseFloat(row.price) || 0);
+    names[rowIndex] = row.name || '';
+    if (!rowIndexesByDate.has(dateKey)) {
+      rowIndexesByDate.set(dateKey, []);
+    }
+    rowIndexesByDate.get(dateKey).push(rowIndex);
+  });
+
+  // Work on account indexes: per date, each account's CC total and running
+  // assigned total sit in flat arrays instead of nested Map/object lookups
+  const accountIndexes = groupAccounts.map((_, idx) => idx);
+  const accountLast4 = groupAccounts.map(acct => getAccountLast4(acct));
+  const allocatedRows = groupAccounts.map(() => []);
+  // Per-date scratch state, allocated once and reset for each date
+  const assignedTotal = new Float64Array(groupAccounts.length);
+  const assignedRowIndexes = groupAccounts.map(() => []);
+  for (const [dateKey, dayRowIndexes] of rowIndexesByDate) {
+    const dayCCTotals = groupAccounts.map(acct => ccTotalsByAccount.get(acct)?.get(dateKey));
+    // Accounts that actually billed on this date; the others can never be scored
+    const dayBilledIndexes = accountIndexes.filter(idx => dayCCTotals[idx] !== undefined);
+    assignedTotal.fill(0);
+
+    dayRowIndexes.sort((a, b) => amounts[b] - amounts[a]);
+    for (const rowIndex of dayRowIndexes) {
+      const amount = amounts[rowIndex];
+      if (amount <= 0) continue;
+
+      const name = names[rowIndex];
+      const hints = new Set(extractDigitSequences(name));
+
+      const digitCandidates = accountIndexes.filter(idx => {
+        const last4 = accountLast4[idx];
+        return hints.has(groupAccounts[idx]) || (last4 && hints.has(last4));
+      });
+
+      let candidates = accountIndexes;
+      let hasSignal = true;
+      if (digitCandidates.length > 0) {
+        candidates = digitCandidates;
+      } else if (nameContainsVendor(name, ccVendor)) {
+        candidates = accountIndexes;
+      } else {
+        candidates = accountIndexes;
+        hasSignal = false;
+      }
+
+      if (!hasSignal) {
+        // No-signal rows are only kept when a billed account absorbs them
+        if (dayBilledIndexes.length === 0) {
+          continue;
+        }
+        const detectedVendor = detectCCVendorFromName(name);
+        if (detectedVendor && detectedVendor !== ccVendor) {
+          continue;
+        }
+      }
+
+      let bestIndex = -1;
+      let bestNewDiff = null;
+      const scoredCandidates = candidates === accountIndexes ? dayBilledIndexes : candidates;
+      for (const idx of scoredCandidates) {
+        const ccTotal = dayCCTotals[idx];
+        if (ccTotal === undefined) continue;
+        const newDiff = Math.abs((assignedTotal[idx] + amount) - ccTotal);
+        if (bestNewDiff === null || newDiff < bestNewDiff) {
+          bestNewDiff = newDiff;
+          bestIndex = idx;
+        }
+      }
+
+      if (bestIndex === -1) {
+        if (!hasSignal) {
+          continue;
+        }
+        bestIndex = candidates[0];
+      } else if (!hasSignal && bestNewDiff !== null && bestNewDiff > EPSILON) {
+        continue;
+      }
+
+      assignedTotal[bestIndex] += amount;
+      assignedRowIndexes[bestIndex].push(rowIndex);
+    }
+
+    for (const idx of accountIndexes) {
+      for (const rowIndex of assignedRowIndexes[idx]) {
+        allocatedRows[idx].push(repaymentRows[rowIndex]);
+      }
+      assignedRowIndexes[idx].length = 0;
+    }
+  }
+
+  return new Map(groupAccounts.map((acct, idx) => [acct, allocatedRows[idx]]));
+}
+
+function buildNoRepaymentsResult({ acknowledged, ccVendor, ccLast4, monthsBack, method }) {
+  return {
+    exists: false,
+    acknowledged,
+    reason: `No bank repayments found matching this credit card (${ccVendor} ${ccLast4 || ''})`,
+    periodMonths: monthsBack,
+    method,
+    cycles: [],
+  };
+}
+
+/**
+ * Group matching repayments by date (line items are part of the response, so
+ * bucket and total them in the same pass over the rows)
+ */
+function groupRepaymentsByDate(matchingRepayments) {
+  const repaymentsByDate = new Map();
+  for (const row of matchingRepayments) {
+    const dateKey = row.repayment_date;
+    let bucket = repaymentsByDate.get(dateKey);
+    if (!bucket) {
+      bucket = {
+        repaymentDate: dateKey,
+        repayments: [],
+        bankTotal: 0,
+      };
+      repaymentsByDate.set(dateKey, bucket);
+    }
+    const price = Number.parseFloat(row.price);
+    bucket.repayments.push({
+      identifier: row.identifier,
+      vendor: row.vendor,
+      accountNumber: row.account_number,
+      date: row.date,
+      cycleDate: dateKey,
+      name: row.name,
+      price,
+    });
+    bucket.bankTotal += Math.abs(price);
+  }
+  return repaymentsByDate;
+}
+
+/**
+ * Classify each repayment cycle against the CC totals for its processed_date
+ * and build the discrepancy summary
+ */
+function summarizeDiscrepancy({
+  repaymentsByDate,
+  ccTotalsByDate,
+  ccAccountNumber,
+  earliestCcCycleDate,
+  acknowledged,
+  monthsBack,
+  method,
+  todayStr,
+}) {
+  const cycles = [];
+
+  for (const [dateKey, repaymentBucket] of repaymentsByDate) {
+    const ccTotals = ccTotalsByDate.get(dateKey) || [];
+
+    // Find the best matching CC account for this repayment
+    let ccTotal = null;
+    let matchedAccount = null;
+    let status = 'missing_cc_cycle';
+
+    if (ccTotals.length > 0) {
+      // Try to find exact or near match
+      for (const [accountNumber, rowTotal] of ccTotals) {
+        const diff = Math.abs(repaymentBucket.bankTotal - rowTotal);
+
+        // Check if this CC account matches based on amount
+        if (diff <= EPSILON) {
+          // Exact match (within tolerance)
+          ccTotal = rowTotal;
+          matchedAccount = accountNumber;
+          status = 'matched';
+          break;
+        } else if (diff <= MAX_FEE_AMOUNT && diff > EPSILON) {
+          // Could be a fee candidate - bank paid more than CC total
+          if (repaymentBucket.bankTotal > rowTotal) {
+            ccTotal = rowTotal;
+            matchedAccount = accountNumber;
+            status = 'fee_candidate';
+          }
+        }
+      }
+
+      // If no exact match, check if CC account matches by account number hint
+      if (status === 'missing_cc_cycle' && ccAccountNumber) {
+        const hinted = ccTotals.find(([accountNumber]) => accountNumber === ccAccountNumber);
+        if (hinted) {
+          const rowTotal = hinted[1];
+          const diff = repaymentBucket.bankTotal - rowTotal;
+          ccTotal = rowTotal;
+          matchedAccount = hinted[0];
+
+          if (Math.abs(diff) <= EPSILON) {
+            status = 'matched';
+          } else if (diff > 0 && diff <= MAX_FEE_AMOUNT) {
+            status = 'fee_candidate';
+          } else if (diff > MAX_FEE_AMOUNT) {
+            status = 'large_discrepancy';
+          } else {
+            status = 'cc_over_bank';
+          }
+        }
+      }
+    }
+
+    const difference = ccTotal === null ? null : (repaymentBucket.bankTotal - ccTotal);
+
+    cycles.push({
+      cycleDate: dateKey,
+      bankTotal: Math.round(repaymentBucket.bankTotal * 100) / 100,
+      ccTotal: ccTotal === null ? null : (Math.round(ccTotal * 100) / 100),
+      difference: difference === null ? null : (Math.round(difference * 100) / 100),
+      repayments: repaymentBucket.repayments,
+      status,
+      matchedAccount,
+    });
+  }
+
+  // Sort cycles by date descending
+  cycles.sort((a, b) => (a.cycleDate < b.cycleDate ? 1 : -1));
+
+  const todayDay = toUtcDayNumber(todayStr);
+  const earliestDay = earliestCcCycleDate ? toUtcDayNumber(earliestCcCycleDate) : null;
+
+  for (const cycle of cycles) {
+    if (!ACTIONABLE_STATUSES.has(cycle.status)) {
+      continue;
+    }
+    const cycleDay = toUtcDayNumber(cycle.cycleDate);
+    if (cycleDay === null) {
+      continue;
+    }
+
+    if (earliestDay !== null) {
+      const daysFromEarliest = cycleDay - earliestDay;
+      if (daysFromEarliest <= EARLY_GRACE_DAYS) {
+        cycle.status = 'incomplete_history';
+        continue;
+      }
+    }
+
+    const daysAgo = todayDay - cycleDay;
+    if (daysAgo >= 0 && daysAgo <= RECENT_GRACE_DAYS) {
+      cycle.status = 'incomplete_history';
+    }
+  }
+
+  // Calculate overall stats in a single pass over the final statuses
+  let totalBankMatched = 0;
+  let totalCCMatched = 0;
+  let matchedCycleCount = 0;
+  let hasDiscrepancy = false;
+  for (const cycle of cycles) {
+    if (cycle.status === 'matched') {
+      matchedCycleCount += 1;
+    } else if (ACTIONABLE_STATUSES.has(cycle.status)) {
+      hasDiscrepancy = true;
+    }
+    if (cycle.ccTotal !== null && cycle.status !== 'incomplete_history') {
+      totalBankMatched += cycle.bankTotal;
+      totalCCMatched += cycle.ccTotal || 0;
+    }
+  }
+  const totalDifference = totalBankMatched - totalCCMatched;
+
+  return {
+    exists: hasDiscrepancy && !acknowledged,
+    acknowledged,
+    totalBankRepayments: Math.round(totalBankMatched * 100) / 100,
+    totalCCExpenses: Math.round(totalCCMatched * 100) / 100,
+    difference: Math.round(totalDifference * 100) / 100,
+    differencePercentage: totalCCMatched > 0
+      ? Math.round((totalDifference / totalCCMatched) * 10000) / 100
+      : 0,
+    periodMonths: monthsBack,
+    method,
+    matchedCycleCount,
+    totalCycles: cycles.length,
+    cycles,
+  };
+}
+
 /**
  * IMPROVED: Calculate discrepancy between bank repayments and CC expenses
  *
@@ -268,22 +797,23 @@ async function calculateDiscrepancy(params) {
     ccVendor,
     ccAccountNumber = null,
     monthsBack = 3,
+    discrepancyAcknowledged,
   } = params;
 
   if (!bankVendor || !ccVendor) {
     return null;
   }
 
-  const todayStr = new Date().toISOString().split('T')[0];
-  const EPSILON = 1.0; // Allow 1 ILS tolerance for rounding
-  const MAX_FEE_AMOUNT = 200;
+  const { todayStr, startDateStr, endExclusiveStr } = getDiscrepancyWindow(monthsBack);
 
   const client = await getDatabase().getClient();
 
   try {
-    // Check if discrepancy was already acknowledged
+    // Check if discrepancy was already acknowledged (skip the lookup when the caller already loaded the pairing)
     let acknowledged = false;
-    if (pairingId) {
+    if (typeof discrepancyAcknowledged === 'boolean') {
+      acknowledged = discrepancyAcknowledged;
+    } else if (pairingId) {
       try {
         const ackRow = (await client.query(
           'SELECT discrepancy_acknowledged FROM account_pairings WHERE id = $1',
@@ -295,79 +825,74 @@ async function calculateDiscrepancy(params) {
       }
     }
 
-    const startDate = new Date();
-    startDate.setMonth(startDate.getMonth() - monthsBack);
-    const startDateStr = startDate.toISOString().split('T')[0];
-
     const repaymentCategoryCondition = repaymentCategoryRef.getCreditCardRepaymentCategoryCondition('cd');
     const ccFeesCategoryId = await getCCFeesCategoryId(client);
-    let earliestCcCycleDate = null;
-    try {
-      const earliestParams = [ccVendor];
-      let earliestAccountFilter = '';
-      if (ccAccountNumber) {
-        earliestParams.push(ccAccountNumber);
-        earliestAccountFilter = `AND t.account_number = $${earliestParams.length}`;
-      }
-
-      let earliestFeesFilter = '';
-      if (ccFeesCategoryId) {
-        earliestParams.push(ccFeesCategoryId);
-        earliestFeesFilter = `AND (t.category_definition_id IS NULL OR t.category_definition_id <> $${earliestParams.length})`;
-      }
-
-      const earliestRow = (await client.query(
-        `
-          SELECT MIN(substr(COALESCE(t.processed_date, t.date), 1, 10)) AS min_date
-          FROM transactions t
-          WHERE t.vendor = $1
-            AND t.status = 'completed'
-            AND t.price < 0
-            ${earliestAccountFilter}
-            ${earliestFeesFilter}
-        `,
-        earliestParams,
-      )).rows?.[0];
-      earliestCcCycleDate = earliestRow?.min_date || null;
-    } catch (_error) {
-      earliestCcCycleDate = null;
-    }
+    const earliestCcCycleDate = await getEarliestCCCycleDate(client, { ccVendor, ccAccountNumber, ccFeesCategoryId });
 
     // Get CC's last-4 and vendor keywords for filtering repayments
     const ccLast4 = getAccountLast4(ccAccountNumber);
-    const ccKeywords = VENDOR_KEYWORDS[ccVendor] || [];
+    const ccMatchPattern = getVendorPattern(ccVendor, ccLast4);
 
     /**
      * Check if a bank repayment matches this specific credit card
      * by looking for the CC's last-4 digits or vendor keywords in the name
      */
     function repaymentMatchesCC(name) {
-      if (!name) return false;
-      const nameLower = name.toLowerCase();
+      if (!name || !ccMatchPattern) return false;
+      return ccMatchPattern.test(name);
+    }
 
-      // Check for last-4 digits
-      if (ccLast4 && name.includes(ccLast4)) {
-        return true;
-      }
+    // If several same-vendor cards share this bank account, repayments are allocated
+    // across them, which needs every repayment row. Otherwise the CC name match is
+    // pushed into the repayment query so only matching rows are fetched.
+    let groupAccounts = [];
+    if (bankAccountNumber && ccAccountNumber) {
+      try {
+        const rows = (await client.query(
+          `
+            SELECT credit_card_account_number
+            FROM account_pairings
+            WHERE is_active = 1
+              AND bank_vendor = $1
+              AND bank_account_number = $2
+              AND credit_card_vendor = $3
+              AND credit_card_account_number IS NOT NULL
+          `,
+          [bankVendor, bankAccountNumber, ccVendor],
+        )).rows || [];
 
-      // Check for vendor keywords
-      for (const kw of ccKeywords) {
-        if (nameLower.includes(kw.toLowerCase())) {
-          return true;
-        }
+        groupAccounts = buildGroupAccounts(rows.map(r => r.credit_card_account_number), ccAccountNumber);
+      } catch (_error) {
+        groupAccounts = [];
       }
-
-      return false;
     }
+    const shouldAllocate = groupAccounts.length >= 2;
 
-    // Step 1: Get all bank repayment transactions
-    const bankParams = [bankVendor, startDateStr, todayStr];
+    // Step 1: Get bank repayment transactions
+    const bankParams = [bankVendor, startDateStr, todayStr, endExclusiveStr];
     let bankAccountFilter = '';
     if (bankAccountNumber) {
       bankParams.push(bankAccountNumber);
       bankAccountFilter = `AND t.account_number = $${bankParams.length}`;
     }
 
+    let bankNameFilter = '';
+    if (!shouldAllocate) {
+      const nameTerms = [...(VENDOR_KEYWORDS[ccVendor] || [])];
+      if (ccLast4) {
+        nameTerms.push(ccLast4);
+      }
+      if (nameTerms.length === 0) {
+        bankNameFilter = 'AND 1 = 0';
+      } else {
+        const nameClauses = nameTerms.map((term) => {
+          bankParams.push(term);
+          return containsInsensitive('t.name', `$${bankParams.length}`);
+        });
+        bankNameFilter = `AND (${nameClauses.join(' OR ')})`;
+      }
+    }
+
     const bankRepaymentsQuery = `
       SELECT
         t.identifier,
@@ -380,213 +905,81 @@ async function calculateDiscrepancy(params) {
       FROM transactions t
       LEFT JOIN category_definitions cd ON cd.id = t.category_definition_id
       WHERE t.vendor = $1
+        AND t.date >= $2
+        AND t.date < $4
         AND substr(t.date, 1, 10) >= $2
         AND substr(t.date, 1, 10) <= $3
         AND t.status = 'completed'
         AND t.price < 0
         AND ${repaymentCategoryCondition}
         ${bankAccountFilter}
+        ${bankNameFilter}
       ORDER BY t.date DESC
-      LIMIT 500
+      LIMIT ${MAX_BANK_REPAYMENT_ROWS}
     `;
 
     const repaymentRows = (await client.query(bankRepaymentsQuery, bankParams)).rows || [];
 
-    // Step 2: Filter repayments for THIS CC. If multiple CCs of the same vendor share
-    // the same bank account, allocate ambiguous repayments (e.g. "מקס ...") across accounts
-    // so we don't duplicate a repayment under multiple cards.
+    // Step 2: Without a shared bank account the rows already match THIS CC. If multiple
+    // CCs of the same vendor share the same bank account, allocate ambiguous repayments
+    // (e.g. "מקס ...") across accounts so we don't duplicate a repayment under multiple cards.
     let method = 'direct';
-    let matchingRepayments = repaymentRows.filter(row => repaymentMatchesCC(row.name));
+    let matchingRepayments = repaymentRows;
+    // The allocation totals already cover every group account over the whole window
+    let ccRows = null;
 
-    if (bankAccountNumber && ccAccountNumber) {
+    if (shouldAllocate) {
       try {
-        const rows = (await client.query(
-          `
-            SELECT credit_card_account_number
-            FROM account_pairings
-            WHERE is_active = 1
-              AND bank_vendor = $1
-              AND bank_account_number = $2
-              AND credit_card_vendor = $3
-              AND credit_card_account_number IS NOT NULL
-          `,
-          [bankVendor, bankAccountNumber, ccVendor],
-        )).rows || [];
-
-        const groupAccounts = Array.from(new Set(
-          rows
-            .map(r => r.credit_card_account_number)
-            .filter(Boolean)
-            .concat([ccAccountNumber]),
-        ));
-
-        if (groupAccounts.length >= 2) {
-          const accountPlaceholders = groupAccounts.map((_, i) => `$${i + 5}`).join(', ');
-          const ccTotalsParams = [ccVendor, startDateStr, todayStr, ccFeesCategoryId || -1, ...groupAccounts];
-
-          const ccTotalsQuery = `
-            SELECT
-              t.account_number,
-              substr(COALESCE(t.processed_date, t.date), 1, 10) AS cycle_date,
-              COALESCE(SUM(
-                CASE
-                  WHEN t.category_definition_id = $4
-                    AND t.price < 0
-                    AND lower(COALESCE(t.name, '')) LIKE '%דמי כרטיס%'
-                    AND (
-                      lower(COALESCE(t.name, '')) LIKE '%פטור%'
-                      OR lower(COALESCE(t.name, '')) LIKE '%הנחה%'
-                    )
-                    THEN t.price
-                  ELSE -t.price
-                END
-              ), 0) AS total
-            FROM transactions t
-            WHERE t.vendor = $1
-              AND t.status = 'completed'
-              AND substr(COALESCE(t.processed_date, t.date), 1, 10) >= $2
-              AND substr(COALESCE(t.processed_date, t.date), 1, 10) <= $3
-              AND t.account_number IN (${accountPlaceholders})
-            GROUP BY t.account_number, substr(COALESCE(t.processed_date, t.date), 1, 10)
-          `;
-
-          const ccTotalsRows = (await client.query(ccTotalsQuery, ccTotalsParams)).rows || [];
-          const ccTotalsByAccount = new Map();
-          for (const row of ccTotalsRows) {
-            const acct = row.account_number;
-            const dateKey = row.cycle_date;
-            const total = Math.max(0, Number.parseFloat(row.total) || 0);
-            if (!acct || !dateKey) continue;
-            if (!ccTotalsByAccount.has(acct)) {
-              ccTotalsByAccount.set(acct, new Map());
-            }
-            ccTotalsByAccount.get(acct).set(dateKey, total);
-          }
-
-          // Allocate repayments per date across the groupAccounts.
-          const repaymentRowsByDate = new Map();
-          for (const row of repaymentRows) {
-            const dateKey = row.repayment_date;
-            if (!dateKey) continue;
-            if (!repaymentRowsByDate.has(dateKey)) {
-              repaymentRowsByDate.set(dateKey, []);
-            }
-            repaymentRowsByDate.get(dateKey).push(row);
-          }
-
-          const allocatedForThisAccount = [];
-          for (const [dateKey, dayRows] of repaymentRowsByDate) {
-            const assignedTotal = Object.fromEntries(groupAccounts.map(a => [a, 0]));
-            const assignedRows = Object.fromEntries(groupAccounts.map(a => [a, []]));
-
-            const sorted = [...dayRows].sort((a, b) => Math.abs(Number.parseFloat(b.price) || 0) - Math.abs(Number.parseFloat(a.price) || 0));
-            for (const row of sorted) {
-              const amount = Math.abs(Number.parseFloat(row.price) || 0);
-              if (amount <= 0) continue;
-
-              const name = row.name || '';
-              const hints = extractDigitSequences(name);
-
-              const digitCandidates = groupAccounts.filter(acct => {
-                const last4 = getAccountLast4(acct);
-                return hints.includes(acct) || (last4 && hints.includes(last4));
-              });
-
-              let candidates = groupAccounts;
-              let hasSignal = true;
-              if (digitCandidates.length > 0) {
-                candidates = digitCandidates;
-              } else if (nameContainsVendor(name, ccVendor)) {
-                candidates = groupAccounts;
-              } else {
-                candidates = groupAccounts;
-                hasSignal = false;
-              }
-
-              if (!hasSignal) {
-                const detectedVendor = detectCCVendorFromName(name);
-                if (detectedVendor && detectedVendor !== ccVendor) {
-                  continue;
-                }
-              }
-
-              let bestAccount = null;
-              let bestNewDiff = null;
-              for (const acct of candidates) {
-                const ccTotal = ccTotalsByAccount.get(acct)?.get(dateKey);
-                if (ccTotal === undefined) continue;
-                const newDiff = Math.abs((assignedTotal[acct] + amount) - ccTotal);
-                if (bestNewDiff === null || newDiff < bestNewDiff) {
-                  bestNewDiff = newDiff;
-                  bestAccount = acct;
-                }
-              }
-
-              if (bestAccount === null) {
-                if (!hasSignal) {
-                  continue;
-                }
-                bestAccount = candidates[0];
-              } else if (!hasSignal && bestNewDiff !== null && bestNewDiff > EPSILON) {
-                continue;
-              }
-
-              assignedTotal[bestAccount] += amount;
-              assignedRows[bestAccount].push(row);
-            }
-
-            allocatedForThisAccount.push(...(assignedRows[ccAccountNumber] || []));
-          }
-
-          matchingRepayments = allocatedForThisAccount;
-          method = 'allocated';
-        }
+        const accountPlaceholders = groupAccounts.map((_, i) => `$${i + 5}`).join(', ');
+        const ccTotalsParams = [ccVendor, startDateStr, todayStr, ccFeesCategoryId || -1, ...groupAccounts];
+
+        const ccTotalsQuery = `
+          SELECT
+            t.account_number,
+            substr(COALESCE(t.processed_date, t.date), 1, 10) AS cycle_date,
+            ${buildCCCycleTotalExpression('$4')} AS total
+          FROM transactions t
+          WHERE t.vendor = $1
+            AND t.status = 'completed'
+            AND substr(COALESCE(t.processed_date, t.date), 1, 10) >= $2
+            AND substr(COALESCE(t.processed_date, t.date), 1, 10) <= $3
+            AND t.account_number IN (${accountPlaceholders})
+          GROUP BY t.account_number, substr(COALESCE(t.processed_date, t.date), 1, 10)
+        `;
+
+        const ccTotalsRows = (await client.query(ccTotalsQuery, ccTotalsParams)).rows || [];
+        matchingRepayments = allocateSharedRepayments({
+          repaymentRows,
+          groupAccounts,
+          ccVendor,
+          ccTotalsByAccount: buildCCTotalsByAccount(ccTotalsRows),
+        }).get(ccAccountNumber) || [];
+        ccRows = ccTotalsRows;
+        method = 'allocated';
       } catch (_error) {
         // Fall back to direct matching.
+        matchingRepayments = repaymentRows.filter(row => repaymentMatchesCC(row.name));
       }
     }
 
     if (matchingRepayments.length === 0) {
-      return {
-        exists: false,
-        acknowledged,
-        reason: `No bank repayments found matching this credit card (${ccVendor} ${ccLast4 || ''})`,
-        periodMonths: monthsBack,
-        method,
-        cycles: [],
-      };
+      return buildNoRepaymentsResult({ acknowledged, ccVendor, ccLast4, monthsBack, method });
     }
 
     // Step 3: Group matching repayments by date
-    const repaymentsByDate = new Map();
-    for (const row of matchingRepayments) {
-      const dateKey = row.repayment_date;
-      if (!repaymentsByDate.has(dateKey)) {
-        repaymentsByDate.set(dateKey, {
-          repaymentDate: dateKey,
-          repayments: [],
-          bankTotal: 0,
-        });
-      }
-      const bucket = repaymentsByDate.get(dateKey);
-      bucket.repayments.push({
-        identifier: row.identifier,
-        vendor: row.vendor,
-        accountNumber: row.account_number,
-        date: row.date,
-        cycleDate: dateKey,
-        name: row.name,
-        price: Number.parseFloat(row.price),
-      });
-      bucket.bankTotal += Math.abs(Number.parseFloat(row.price));
-    }
-
-    // Step 3: For each repayment date, query CC transactions with that processed_date
-    const cycles = [];
-
-    for (const [dateKey, repaymentBucket] of repaymentsByDate) {
-      // Query CC transactions for this specific processed_date
-      const ccParams = [ccVendor, dateKey, ccFeesCategoryId || -1];
+    const repaymentsByDate = groupRepaymentsByDate(matchingRepayments);
+
+    // Step 3: Fetch CC totals for every repayment date in one grouped query
+    // (per processed_date and account) instead of one query per cycle; allocated
+    // mode reuses the per-account totals it has already loaded.
+    if (!ccRows) {
+      const repaymentDateKeys = Array.from(repaymentsByDate.keys()).sort();
+      const ccParams = [
+        ccVendor,
+        repaymentDateKeys[0],
+        repaymentDateKeys[repaymentDateKeys.length - 1],
+        ccFeesCategoryId || -1,
+      ];
       let ccAccountFilter = '';
       if (ccAccountNumber) {
         ccParams.push(ccAccountNumber);
@@ -596,156 +989,279 @@ async function calculateDiscrepancy(params) {
       // Use substr for consistent date comparison (handles both ISO strings and date-only)
       const ccQuery = `
         SELECT
+          substr(COALESCE(t.processed_date, t.date), 1, 10) AS cycle_date,
           t.account_number,
-          COALESCE(SUM(
-            CASE
-              WHEN t.category_definition_id = $3
-                AND t.price < 0
-                AND lower(COALESCE(t.name, '')) LIKE '%דמי כרטיס%'
-                AND (
-                  lower(COALESCE(t.name, '')) LIKE '%פטור%'
-                  OR lower(COALESCE(t.name, '')) LIKE '%הנחה%'
-                )
-                THEN t.price
-              ELSE -t.price
-            END
-          ), 0) AS total,
+          ${buildCCCycleTotalExpression('$4')} AS total,
           COUNT(*) as txn_count
         FROM transactions t
         WHERE t.vendor = $1
           AND t.status = 'completed'
-          AND substr(COALESCE(t.processed_date, t.date), 1, 10) = $2
+          AND substr(COALESCE(t.processed_date, t.date), 1, 10) >= $2
+          AND substr(COALESCE(t.processed_date, t.date), 1, 10) <= $3
           ${ccAccountFilter}
-        GROUP BY t.account_number
+        GROUP BY substr(COALESCE(t.processed_date, t.date), 1, 10), t.account_number
       `;
 
-      const ccRows = (await client.query(ccQuery, ccParams)).rows || [];
+      ccRows = (await client.query(ccQuery, ccParams)).rows || [];
+    }
 
-      // Find the best matching CC account for this repayment
-      let ccTotal = null;
-      let matchedAccount = null;
-      let status = 'missing_cc_cycle';
+    return summarizeDiscrepancy({
+      repaymentsByDate,
+      ccTotalsByDate: groupCCTotalsByDate(ccRows, ccAccountNumber),
+      ccAccountNumber,
+      earliestCcCycleDate,
+      acknowledged,
+      monthsBack,
+      method,
+      todayStr,
+    });
+  } finally {
+    client.release();
+  }
+}
 
-      if (ccRows.length > 0) {
-        // Extract account number hints from repayment names
-        const accountHints = new Set();
-        repaymentBucket.repayments.forEach(r => {
-          const hints = extractDigitSequences(r.name);
-          hints.forEach(h => accountHints.add(h));
-        });
+/**
+ * Calculate discrepancies for several pairings at once (e.g. every active pairing).
+ *
+ * Instead of running calculateDiscrepancy's queries once per pairing, this fetches
+ * pairing metadata, earliest CC cycles, bank repayments and CC cycle totals with one
+ * query each across all involved vendors, then matches every pairing in memory.
+ * Returns results in the same order as the given pairings (null for incomplete ones).
+ */
+async function calculateDiscrepancies({ pairings = [], monthsBack = 3 } = {}) {
+  const validPairings = pairings.filter(p => p && p.bankVendor && p.creditCardVendor);
+  if (validPairings.length === 0) {
+    return pairings.map(() => null);
+  }
 
-        // Try to find exact or near match
-        for (const ccRow of ccRows) {
-          const rowTotal = Math.max(0, Number.parseFloat(ccRow.total) || 0);
-          const diff = Math.abs(repaymentBucket.bankTotal - rowTotal);
+  const { todayStr, startDateStr, endExclusiveStr } = getDiscrepancyWindow(monthsBack);
+  const bankVendors = Array.from(new Set(validPairings.map(p => p.bankVendor)));
+  const ccVendors = Array.from(new Set(validPairings.map(p => p.creditCardVendor)));
 
-          // Check if this CC account matches based on amount
-          if (diff <= EPSILON) {
-            // Exact match (within tolerance)
-            ccTotal = rowTotal;
-            matchedAccount = ccRow.account_number;
-            status = 'matched';
-            break;
-          } else if (diff <= MAX_FEE_AMOUNT && diff > EPSILON) {
-            // Could be a fee candidate - bank paid more than CC total
-            if (repaymentBucket.bankTotal > rowTotal) {
-              ccTotal = rowTotal;
-              matchedAccount = ccRow.account_number;
-              status = 'fee_candidate';
-            }
-          }
-        }
+  const client = await getDatabase().getClient();
 
-        // If no exact match, check if CC account matches by account number hint
-        if (status === 'missing_cc_cycle' && ccAccountNumber) {
-          const ccRow = ccRows.find(r => r.account_number === ccAccountNumber);
-          if (ccRow) {
-            const rowTotal = Math.max(0, Number.parseFloat(ccRow.total) || 0);
-            const diff = repaymentBucket.bankTotal - rowTotal;
-            ccTotal = rowTotal;
-            matchedAccount = ccRow.account_number;
-
-            if (Math.abs(diff) <= EPSILON) {
-              status = 'matched';
-            } else if (diff > 0 && diff <= MAX_FEE_AMOUNT) {
-              status = 'fee_candidate';
-            } else if (diff > MAX_FEE_AMOUNT) {
-              status = 'large_discrepancy';
-            } else {
-              status = 'cc_over_bank';
-            }
-          }
-        }
+  try {
+    let pairingRows = [];
+    try {
+      pairingRows = (await client.query(`
+        SELECT
+          id,
+          bank_vendor,
+          bank_account_number,
+          credit_card_vendor,
+          credit_card_account_number,
+          is_active,
+          discrepancy_acknowledged
+        FROM account_pairings
+      `)).rows || [];
+    } catch (error) {
+      console.warn('[auto-pairing] Failed to read account pairings', error);
+    }
+    const acknowledgedById = new Map(
+      pairingRows.map(row => [row.id, Boolean(row.discrepancy_acknowledged)]),
+    );
+    // Active card accounts per (bank vendor, bank account, card vendor), grouped once
+    // so each pairing looks up its shared-account group instead of rescanning every row
+    const activeCardAccountsByBankAccount = new Map();
+    for (const row of pairingRows) {
+      if (Number(row.is_active) !== 1) continue;
+      const groupKey = `${row.bank_vendor}|${row.bank_account_number}|${row.credit_card_vendor}`;
+      if (!activeCardAccountsByBankAccount.has(groupKey)) {
+        activeCardAccountsByBankAccount.set(groupKey, []);
       }
+      activeCardAccountsByBankAccount.get(groupKey).push(row.credit_card_account_number);
+    }
 
-      const difference = ccTotal === null ? null : (repaymentBucket.bankTotal - ccTotal);
+    const repaymentCategoryCondition = repaymentCategoryRef.getCreditCardRepaymentCategoryCondition('cd');
+    const ccFeesCategoryId = await getCCFeesCategoryId(client);
 
-      cycles.push({
-        cycleDate: dateKey,
-        bankTotal: Math.round(repaymentBucket.bankTotal * 100) / 100,
-        ccTotal: ccTotal === null ? null : (Math.round(ccTotal * 100) / 100),
-        difference: difference === null ? null : (Math.round(difference * 100) / 100),
-        repayments: repaymentBucket.repayments,
-        status,
-        matchedAccount,
-      });
-    }
+    const ccVendorPlaceholders = ccVendors.map((_, i) => `$${i + 1}`).join(', ');
+    let earliestRows = [];
+    try {
+      const earliestParams = [...ccVendors];
+      let earliestFeesFilter = '';
+      if (ccFeesCategoryId) {
+        earliestParams.push(ccFeesCategoryId);
+        earliestFeesFilter = `AND (t.category_definition_id IS NULL OR t.category_definition_id <> $${earliestParams.length})`;
+      }
 
-    // Sort cycles by date descending
-    cycles.sort((a, b) => (a.cycleDate < b.cycleDate ? 1 : -1));
+      earliestRows = (await client.query(
+        `
+          SELECT
+            t.vendor,
+            t.account_number,
+            MIN(substr(COALESCE(t.processed_date, t.date), 1, 10)) AS min_date
+          FROM transactions t
+          WHERE t.vendor IN (${ccVendorPlaceholders})
+            AND t.status = 'completed'
+            AND t.price < 0
+            ${earliestFeesFilter}
+          GROUP BY t.vendor, t.account_number
+        `,
+        earliestParams,
+      )).rows || [];
+    } catch (_error) {
+      earliestRows = [];
+    }
 
-    const actionableStatuses = new Set(['fee_candidate', 'large_discrepancy', 'cc_over_bank', 'missing_cc_cycle']);
-    const EARLY_GRACE_DAYS = 14;
-    const RECENT_GRACE_DAYS = 14;
-    const todayDate = new Date(`${todayStr}T00:00:00Z`);
-    const earliestDate = earliestCcCycleDate ? new Date(`${earliestCcCycleDate}T00:00:00Z`) : null;
+    const bankVendorPlaceholders = bankVendors.map((_, i) => `$${i + 4}`).join(', ');
+    const bankRows = (await client.query(
+      `
+        SELECT
+          t.identifier,
+          t.vendor,
+          t.account_number,
+          t.date,
+          substr(t.date, 1, 10) as repayment_date,
+          t.name,
+          t.price
+        FROM transactions t
+        LEFT JOIN category_definitions cd ON cd.id = t.category_definition_id
+        WHERE t.vendor IN (${bankVendorPlaceholders})
+          AND t.date >= $1
+          AND t.date < $3
+          AND substr(t.date, 1, 10) >= $1
+          AND substr(t.date, 1, 10) <= $2
+          AND t.status = 'completed'
+          AND t.price < 0
+          AND ${repaymentCategoryCondition}
+        ORDER BY t.date DESC
+      `,
+      [startDateStr, todayStr, endExclusiveStr, ...bankVendors],
+    )).rows || [];
+
+    const ccTotalsRows = (await client.query(
+      `
+        SELECT
+          t.vendor,
+          substr(COALESCE(t.processed_date, t.date), 1, 10) AS cycle_date,
+          t.account_number,
+          ${buildCCCycleTotalExpression('$3')} AS total,
+          COUNT(*) as txn_count
+        FROM transactions t
+        WHERE t.vendor IN (${ccVendors.map((_, i) => `$${i + 4}`).join(', ')})
+          AND t.status = 'completed'
+          AND substr(COALESCE(t.processed_date, t.date), 1, 10) >= $1
+          AND substr(COALESCE(t.processed_date, t.date), 1, 10) <= $2
+        GROUP BY t.vendor, substr(COALESCE(t.processed_date, t.date), 1, 10), t.account_number
+      `,
+      [startDateStr, todayStr, ccFeesCategoryId || -1, ...ccVendors],
+    )).rows || [];
+
+    const ccTotalsRowsByVendor = new Map();
+    for (const row of ccTotalsRows) {
+      if (!ccTotalsRowsByVendor.has(row.vendor)) {
+        ccTotalsRowsByVendor.set(row.vendor, []);
+      }
+      ccTotalsRowsByVendor.get(row.vendor).push(row);
+    }
+    const ccTotalsByAccountByVendor = new Map();
+    const allocationsByGroup = new Map();
+    const ccTotalsByDateByCard = new Map();
+    // Bank rows per (vendor, account), so pairings on the same bank account
+    // filter that account's rows instead of rescanning every batch row
+    const bankRowsByAccount = new Map();
+
+    // Earliest cycle per (vendor, account) and per vendor across accounts, so pairings
+    // that share a card (or have no account) reuse one lookup instead of rescanning
+    const earliestByCard = new Map();
+    for (const row of earliestRows) {
+      if (!row.min_date) continue;
+      // Rows without an account only count toward the vendor-wide key, so no 'vendor|null' key is built
+      const keys = row.account_number ? [`${row.vendor}|${row.account_number}`, `${row.vendor}|`] : [`${row.vendor}|`];
+      for (const key of keys) {
+        const current = earliestByCard.get(key);
+        if (current === undefined || row.min_date < current) {
+          earliestByCard.set(key, row.min_date);
+        }
+      }
+    }
 
-    for (const cycle of cycles) {
-      if (!actionableStatuses.has(cycle.status)) {
-        continue;
+    return pairings.map((pairing) => {
+      if (!pairing || !pairing.bankVendor || !pairing.creditCardVendor) {
+        return null;
       }
-      const cycleDate = new Date(`${cycle.cycleDate}T00:00:00Z`);
-      if (Number.isNaN(cycleDate.getTime())) {
-        continue;
+
+      const {
+        id: pairingId = null,
+        bankVendor,
+        bankAccountNumber = null,
+        creditCardVendor: ccVendor,
+        creditCardAccountNumber: ccAccountNumber = null,
+      } = pairing;
+
+      const acknowledged = pairingId ? (acknowledgedById.get(pairingId) || false) : false;
+
+      const cardKey = `${ccVendor}|${ccAccountNumber || ''}`;
+      const earliestCcCycleDate = earliestByCard.get(cardKey) || null;
+
+      const ccLast4 = getAccountLast4(ccAccountNumber);
+      const ccMatchPattern = getVendorPattern(ccVendor, ccLast4);
+      const repaymentMatchesCC = name => Boolean(name && ccMatchPattern && ccMatchPattern.test(name));
+
+      let groupAccounts = [];
+      if (bankAccountNumber && ccAccountNumber) {
+        groupAccounts = buildGroupAccounts(
+          activeCardAccountsByBankAccount.get(`${bankVendor}|${bankAccountNumber}|${ccVendor}`) || [],
+          ccAccountNumber,
+        );
       }
+      const shouldAllocate = groupAccounts.length >= 2;
 
-      if (earliestDate) {
-        const daysFromEarliest = Math.floor((cycleDate.getTime() - earliestDate.getTime()) / (24 * 60 * 60 * 1000));
-        if (daysFromEarliest <= EARLY_GRACE_DAYS) {
-          cycle.status = 'incomplete_history';
-          continue;
+      const bankKey = `${bankVendor}|${bankAccountNumber || ''}`;
+      if (!bankRowsByAccount.has(bankKey)) {
+        bankRowsByAccount.set(bankKey, bankRows.filter(row => row.vendor === bankVendor
+          && (!bankAccountNumber || row.account_number === bankAccountNumber)));
+      }
+      const accountRows = bankRowsByAccount.get(bankKey);
+      const repaymentRows = (shouldAllocate ? accountRows : accountRows.filter(row => repaymentMatchesCC(row.name)))
+        .slice(0, MAX_BANK_REPAYMENT_ROWS);
+
+      let method = 'direct';
+      let matchingRepayments = repaymentRows;
+      if (shouldAllocate) {
+        if (!ccTotalsByAccountByVendor.has(ccVendor)) {
+          ccTotalsByAccountByVendor.set(
+            ccVendor,
+            buildCCTotalsByAccount(ccTotalsRowsByVendor.get(ccVendor) || []),
+          );
         }
+        // Cards sharing a bank account get the same assignment; run it once per group
+        const allocationKey = `${bankVendor}|${bankAccountNumber}|${ccVendor}|${groupAccounts.join(',')}`;
+        if (!allocationsByGroup.has(allocationKey)) {
+          allocationsByGroup.set(allocationKey, allocateSharedRepayments({
+            repaymentRows,
+            groupAccounts,
+            ccVendor,
+            ccTotalsByAccount: ccTotalsByAccountByVendor.get(ccVendor),
+          }));
+        }
+        matchingRepayments = allocationsByGroup.get(allocationKey).get(ccAccountNumber) || [];
+        method = 'allocated';
       }
 
-      const daysAgo = Math.floor((todayDate.getTime() - cycleDate.getTime()) / (24 * 60 * 60 * 1000));
-      if (daysAgo >= 0 && daysAgo <= RECENT_GRACE_DAYS) {
-        cycle.status = 'incomplete_history';
+      if (matchingRepayments.length === 0) {
+        return buildNoRepaymentsResult({ acknowledged, ccVendor, ccLast4, monthsBack, method });
+      }
+
+      if (!ccTotalsByDateByCard.has(cardKey)) {
+        ccTotalsByDateByCard.set(
+          cardKey,
+          groupCCTotalsByDate(ccTotalsRowsByVendor.get(ccVendor) || [], ccAccountNumber),
+        );
       }
-    }
 
-    // Calculate overall stats
-    const comparableCycles = cycles.filter(c => c.ccTotal !== null && c.status !== 'incomplete_history');
-    const totalBankMatched = comparableCycles.reduce((sum, c) => sum + c.bankTotal, 0);
-    const totalCCMatched = comparableCycles.reduce((sum, c) => sum + (c.ccTotal || 0), 0);
-    const totalDifference = totalBankMatched - totalCCMatched;
-
-    const hasDiscrepancy = cycles.some(c => actionableStatuses.has(c.status));
-
-	    return {
-	      exists: hasDiscrepancy && !acknowledged,
-	      acknowledged,
-	      totalBankRepayments: Math.round(totalBankMatched * 100) / 100,
-	      totalCCExpenses: Math.round(totalCCMatched * 100) / 100,
-	      difference: Math.round(totalDifference * 100) / 100,
-	      differencePercentage: totalCCMatched > 0
-	        ? Math.round((totalDifference / totalCCMatched) * 10000) / 100
-	        : 0,
-	      periodMonths: monthsBack,
-	      method,
-	      matchedCycleCount: cycles.filter(c => c.status === 'matched').length,
-	      totalCycles: cycles.length,
-	      cycles,
-	    };
+      return summarizeDiscrepancy({
+        repaymentsByDate: groupRepaymentsByDate(matchingRepayments),
+        ccTotalsByDate: ccTotalsByDateByCard.get(cardKey),
+        ccAccountNumber,
+        earliestCcCycleDate,
+        acknowledged,
+        monthsBack,
+        method,
+        todayStr,
+      });
+    });
   } finally {
     client.release();
   }
@@ -922,10 +1438,14 @@ let testDatabase = null;
 
 function __setDatabase(db) {
   testDatabase = db;
+  resetCCFeesCategoryCache();
+  resetEarliestCCCycleDateCache();
 }
 
 function __resetDatabase() {
   testDatabase = null;
+  resetCCFeesCategoryCache();
+  resetEarliestCCCycleDateCache();
 }
 
 function __setDependencies(overrides = {}) {
@@ -950,6 +1470,9 @@ module.exports = {
   autoPairCreditCard,
   findBestBankAccount,
   calculateDiscrepancy,
+  calculateDiscrepancies,
+  resetCCFeesCategoryCache,
+  resetEarliestCCCycleDateCache,
   _internal: {
     applyPairingToTransactions,
     buildMatchPatterns,
@@ -957,7 +1480,10 @@ module.exports = {
     extractDigitSequences,
     getAccountLast4,
     getCCFeesCategoryId,
+    getEarliestCCCycleDate,
+    getVendorPattern,
     nameContainsVendor,
+    toUtcDayNumber,
   },
   __setDatabase,
   __resetDatabase,
@@ -11,6 +11,13 @@ const VENDOR_KEYWORDS = {
   diners: ['דיינרס', 'diners'],
 };
 
+// [keyword, lowercased keyword] pairs per vendor, lowercased once at load
+const LOWERED_VENDOR_KEYWORDS = Object.entries(VENDOR_KEYWORDS).map(([vendor, keywords]) => [
+  vendor,
+  keywords.map(keyword => [keyword, keyword.toLowerCase()]),
+]);
+const LOWERED_KEYWORDS_BY_VENDOR = Object.fromEntries(LOWERED_VENDOR_KEYWORDS);
+
 // Vendor display labels
 const VENDOR_LABELS = {
   visaCal: 'Visa Cal',
@@ -44,10 +51,12 @@ function extractCardNumber(transactionName) {
 function detectVendorFromName(transactionName) {
   if (!transactionName) return null;
 
-  const nameLower = transactionName.toLowerCase();
+  return detectVendorFromLowerName(transactionName.toLowerCase());
+}
 
-  for (const [vendor, keywords] of Object.entries(VENDOR_KEYWORDS)) {
-    if (keywords.some(keyword => nameLower.includes(keyword.toLowerCase()))) {
+function detectVendorFromLowerName(nameLower) {
+  for (const [vendor, keywords] of LOWERED_VENDOR_KEYWORDS) {
+    if (keywords.some(([, keywordLower]) => nameLower.includes(keywordLower))) {
       return vendor;
     }
   }
@@ -134,7 +143,9 @@ async function detectCreditCardSuggestions() {
     const vendorGroups = {};
 
     result.rows.forEach((row) => {
-      const detectedVendor = detectVendorFromName(row.name);
+      // Lowercase each name once for both vendor detection and keyword tracking
+      const nameLower = row.name ? row.name.toLowerCase() : '';
+      const detectedVendor = nameLower ? detectVendorFromLowerName(nameLower) : null;
 
       if (!detectedVendor) return; // Skip if no vendor detected
 
@@ -167,9 +178,8 @@ async function detectCreditCardSuggestions() {
       }
 
       // Track matched keywords
-      const nameLower = row.name.toLowerCase();
-      VENDOR_KEYWORDS[detectedVendor].forEach(keyword => {
-        if (nameLower.includes(keyword.toLowerCase())) {
+      LOWERED_KEYWORDS_BY_VENDOR[detectedVendor].forEach(([keyword, keywordLower]) => {
+        if (nameLower.includes(keywordLower)) {
           group.matchedKeywords.add(keyword);
         }
       });
@@ -120,16 +120,13 @@ async function getCurrentMonthPairingGap(params = {}) {
     return response;
   }
 
-  const pairingResults = await Promise.all(pairings.map(async (pairing) => {
-    const discrepancy = await autoPairingService.calculateDiscrepancy({
-      pairingId: pairing.id,
-      bankVendor: pairing.bankVendor,
-      bankAccountNumber: pairing.bankAccountNumber,
-      ccVendor: pairing.creditCardVendor,
-      ccAccountNumber: pairing.creditCardAccountNumber,
-      monthsBack: DISCREPANCY_MONTHS_BACK,
-    });
+  const discrepancies = await autoPairingService.calculateDiscrepancies({
+    pairings,
+    monthsBack: DISCREPANCY_MONTHS_BACK,
+  });
 
+  const pairingResults = pairings.map((pairing, index) => {
+    const discrepancy = discrepancies?.[index];
     const cycles = Array.isArray(discrepancy?.cycles) ? discrepancy.cycles : [];
     const scopedCycles = cycles.filter((cycle) =>
       isWithinWindow(cycle?.cycleDate, windowStartDate, windowEndDate),
@@ -168,15 +165,15 @@ async function getCurrentMonthPairingGap(params = {}) {
       return null;
     }
 
-    const bankAmount = roundCurrency(
-      affectedCycles.reduce((sum, cycle) => sum + cycle.bankAmount, 0),
-    );
-    const cardAmount = roundCurrency(
-      affectedCycles.reduce((sum, cycle) => sum + cycle.cardAmount, 0),
-    );
-    const missingAmount = roundCurrency(
-      affectedCycles.reduce((sum, cycle) => sum + cycle.missingAmount, 0),
-    );
+    // Accumulate all three totals in one pass over the affected cycles
+    let bankAmount = 0;
+    let cardAmount = 0;
+    let missingAmount = 0;
+    for (const cycle of affectedCycles) {
+      bankAmount += cycle.bankAmount;
+      cardAmount += cycle.cardAmount;
+      missingAmount += cycle.missingAmount;
+    }
 
     return {
       pairingId: pairing.id,
@@ -184,33 +181,34 @@ async function getCurrentMonthPairingGap(params = {}) {
       creditCardAccountNumber: pairing.creditCardAccountNumber,
       bankVendor: pairing.bankVendor,
       bankAccountNumber: pairing.bankAccountNumber,
-      bankAmount,
-      cardAmount,
-      missingAmount,
+      bankAmount: roundCurrency(bankAmount),
+      cardAmount: roundCurrency(cardAmount),
+      missingAmount: roundCurrency(missingAmount),
       affectedCyclesCount: affectedCycles.length,
       cycles: affectedCycles,
     };
-  }));
+  });
 
   const affectedPairings = pairingResults
     .filter(Boolean)
     .sort((a, b) => b.missingAmount - a.missingAmount || a.pairingId - b.pairingId);
 
   response.pairings = affectedPairings;
-  response.totals.bankAmount = roundCurrency(
-    affectedPairings.reduce((sum, pairing) => sum + pairing.bankAmount, 0),
-  );
-  response.totals.cardAmount = roundCurrency(
-    affectedPairings.reduce((sum, pairing) => sum + pairing.cardAmount, 0),
-  );
-  response.totals.missingAmount = roundCurrency(
-    affectedPairings.reduce((sum, pairing) => sum + pairing.missingAmount, 0),
-  );
+  let totalBankAmount = 0;
+  let totalCardAmount = 0;
+  let totalMissingAmount = 0;
+  let totalAffectedCycles = 0;
+  for (const pairing of affectedPairings) {
+    totalBankAmount += pairing.bankAmount;
+    totalCardAmount += pairing.cardAmount;
+    totalMissingAmount += pairing.missingAmount;
+    totalAffectedCycles += pairing.affectedCyclesCount;
+  }
+  response.totals.bankAmount = roundCurrency(totalBankAmount);
+  response.totals.cardAmount = roundCurrency(totalCardAmount);
+  response.totals.missingAmount = roundCurrency(totalMissingAmount);
   response.totals.affectedPairingsCount = affectedPairings.length;
-  response.totals.affectedCyclesCount = affectedPairings.reduce(
-    (sum, pairing) => sum + pairing.affectedCyclesCount,
-    0,
-  );
+  response.totals.affectedCyclesCount = totalAffectedCycles;
 
   return response;
 }
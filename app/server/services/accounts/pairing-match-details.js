@@ -57,18 +57,25 @@ function findCycleForPendingTransactionDate(txnDate, cycleDatesAsc) {
     return null;
   }
 
-  for (const cycleDate of cycleDatesAsc) {
-    if (cycleDate < normalizedTxnDate) {
-      continue;
+  // Binary search for the first cycle on or after the transaction date; later
+  // cycles are only further ahead, so it is the only candidate worth checking
+  let low = 0;
+  let high = cycleDatesAsc.length;
+  while (low < high) {
+    const mid = (low + high) >>> 1;
+    if (cycleDatesAsc[mid] < normalizedTxnDate) {
+      low = mid + 1;
+    } else {
+      high = mid;
     }
+  }
 
-    const daysAhead = diffDays(cycleDate, normalizedTxnDate);
-    if (daysAhead <= PENDING_CYCLE_MAX_LOOKAHEAD_DAYS) {
-      return cycleDate;
-    }
+  if (low === cycleDatesAsc.length) {
+    return null;
   }
 
-  return null;
+  const cycleDate = cycleDatesAsc[low];
+  return diffDays(cycleDate, normalizedTxnDate) <= PENDING_CYCLE_MAX_LOOKAHEAD_DAYS ? cycleDate : null;
 }
 
 function normalizePairing(row) {
@@ -297,11 +304,19 @@ async function getPendingCardTotalsByCycle(client, pairing, cycleDates) {
     params,
   );
 
+  // Pending transactions cluster on a few days; resolve each distinct day's cycle once
+  const cycleByTxnDate = new Map();
+
   for (const row of result.rows || []) {
     const hintedCycleDate = toIsoDate(row.hinted_cycle_date);
-    const targetCycleDate = hintedCycleDate && cycleDatesSet.has(hintedCycleDate)
-      ? hintedCycleDate
-      : findCycleForPendingTransactionDate(row.txn_date, cycleDatesAsc);
+    let targetCycleDate = hintedCycleDate && cycleDatesSet.has(hintedCycleDate) ? hintedCycleDate : undefined;
+    if (targetCycleDate === undefined) {
+      targetCycleDate = cycleByTxnDate.get(row.txn_date);
+      if (targetCycleDate === undefined) {
+        targetCycleDate = findCycleForPendingTransactionDate(row.txn_date, cycleDatesAsc);
+        cycleByTxnDate.set(row.txn_date, targetCycleDate);
+      }
+    }
 
     if (!targetCycleDate) {
       continue;
@@ -335,15 +350,24 @@ function classifyRepaymentStatus({ sharedPairingsCount, remainingAmount, matched
 }
 
 function applyInferredAmountCycleMatches(repayments, cardTransactions) {
+  // Shallow working copies, updated in place as matches are inferred
   const nextRepayments = repayments.map((repayment) => ({ ...repayment }));
   const nextCardTransactions = cardTransactions.map((cardTxn) => ({ ...cardTxn }));
 
+  // Per-card values parsed once and indexed by position: expense rows, absolute
+  // amounts, and rows still free to link (cleared as matches are made)
+  const isExpense = new Uint8Array(nextCardTransactions.length);
+  const absAmounts = new Float64Array(nextCardTransactions.length);
+  const isUnlinked = new Uint8Array(nextCardTransactions.length);
   const availableCardTxnIndexesByAmount = new Map();
   for (let idx = 0; idx < nextCardTransactions.length; idx += 1) {
     const cardTxn = nextCardTransactions[idx];
-    const alreadyLinked = Number.parseInt(cardTxn.linkedRepaymentCount, 10) > 0;
-    const isExpense = Number.parseFloat(cardTxn.price) < 0;
-    if (alreadyLinked || !isExpense) {
+    const linkedCount = Number.parseInt(cardTxn.linkedRepaymentCount, 10);
+    const price = Number.parseFloat(cardTxn.price);
+    isExpense[idx] = price < 0 ? 1 : 0;
+    absAmounts[idx] = Math.abs(price || 0);
+    isUnlinked[idx] = linkedCount === 0 ? 1 : 0;
+    if (!isUnlinked[idx] || !isExpense[idx]) {
       continue;
     }
 
@@ -355,6 +379,11 @@ function applyInferredAmountCycleMatches(repayments, cardTransactions) {
   }
 
   for (let repaymentIdx = 0; repaymentIdx < nextRepayments.length; repaymentIdx += 1) {
+    // Every free expense is taken; remaining repayments cannot match or turn ambiguous
+    if (availableCardTxnIndexesByAmount.size === 0) {
+      break;
+    }
+
     const repayment = nextRepayments[repaymentIdx];
     const alreadyLinked = Number.parseInt(repayment.linkedExpenseCount, 10) > 0;
 
@@ -363,95 +392,85 @@ function applyInferredAmountCycleMatches(repayments, cardTransactions) {
     }
 
     const amountKey = toAgorot(repayment.absAmount);
-    const candidateIndexes = (availableCardTxnIndexesByAmount.get(amountKey) || []).filter((cardTxnIdx) => {
-      const cardTxn = nextCardTransactions[cardTxnIdx];
-      return Number.parseInt(cardTxn.linkedRepaymentCount, 10) === 0;
-    });
+    // Buckets only hold unlinked expenses, and a linked one leaves its bucket,
+    // so the bucket is the candidate list as-is
+    const candidateIndexes = availableCardTxnIndexesByAmount.get(amountKey) || [];
 
     if (candidateIndexes.length === 1) {
       const cardTxnIdx = candidateIndexes[0];
       const cardTxn = nextCardTransactions[cardTxnIdx];
+      isUnlinked[cardTxnIdx] = 0;
+      availableCardTxnIndexesByAmount.delete(amountKey);
 
-      nextRepayments[repaymentIdx] = {
-        ...repayment,
+      Object.assign(repayment, {
         matchedAmount: roundCurrency(repayment.absAmount),
         remainingAmount: 0,
         linkedExpenseCount: 1,
         linkedExpenseTxnIds: [cardTxn.identifier],
         status: 'matched',
         matchSource: 'inferred_amount_cycle',
-      };
+      });
 
-      nextCardTransactions[cardTxnIdx] = {
-        ...cardTxn,
+      Object.assign(cardTxn, {
         linkedRepaymentCount: 1,
         linkedRepaymentIds: [repayment.identifier],
         isLinked: true,
         linkMethod: 'inferred_amount_cycle',
-      };
+      });
       continue;
     }
 
     if (candidateIndexes.length > 1 && repayment.status === 'unmatched') {
-      nextRepayments[repaymentIdx] = {
-        ...repayment,
-        status: 'ambiguous',
-      };
+      repayment.status = 'ambiguous';
     }
   }
 
   // Bundle matching fallback:
   // If one unlinked repayment remains and multiple unlinked expense rows in the cycle
   // sum exactly to that repayment, infer a bundled match for the selected pairing.
-  const bundleCandidateRepaymentIndexes = nextRepayments
-    .map((repayment, idx) => ({ repayment, idx }))
-    .filter(({ repayment }) =>
-      (repayment.status === 'ambiguous' || repayment.status === 'unmatched')
-      && Number.parseInt(repayment.linkedExpenseCount, 10) === 0
-    )
-    .map(({ idx }) => idx);
-
-  const unlinkedExpenseIndexes = nextCardTransactions
-    .map((cardTxn, idx) => ({ cardTxn, idx }))
-    .filter(({ cardTxn }) =>
-      Number.parseFloat(cardTxn.price) < 0
-      && Number.parseInt(cardTxn.linkedRepaymentCount, 10) === 0
-    )
-    .map(({ idx }) => idx);
+  const bundleCandidateRepaymentIndexes = [];
+  for (let idx = 0; idx < nextRepayments.length; idx += 1) {
+    const repayment = nextRepayments[idx];
+    if ((repayment.status === 'ambiguous' || repayment.status === 'unmatched')
+      && Number.parseInt(repayment.linkedExpenseCount, 10) === 0) {
+      bundleCandidateRepaymentIndexes.push(idx);
+    }
+  }
+
+  const unlinkedExpenseIndexes = [];
+  for (let idx = 0; idx < nextCardTransactions.length; idx += 1) {
+    if (isExpense[idx] === 1 && isUnlinked[idx] === 1) {
+      unlinkedExpenseIndexes.push(idx);
+    }
+  }
 
   if (bundleCandidateRepaymentIndexes.length === 1 && unlinkedExpenseIndexes.length >= 2) {
     const repaymentIdx = bundleCandidateRepaymentIndexes[0];
     const repayment = nextRepayments[repaymentIdx];
     const bundledAmount = roundCurrency(
-      unlinkedExpenseIndexes.reduce((sum, cardTxnIdx) => {
-        const cardTxn = nextCardTransactions[cardTxnIdx];
-        return sum + Math.abs(Number.parseFloat(cardTxn.price) || 0);
-      }, 0),
+      unlinkedExpenseIndexes.reduce((sum, cardTxnIdx) => sum + absAmounts[cardTxnIdx], 0),
     );
     const remainingAmount = roundCurrency(Math.max(0, repayment.absAmount - bundledAmount));
 
     if (remainingAmount <= MATCHED_TOLERANCE) {
       const linkedExpenseTxnIds = unlinkedExpenseIndexes.map((cardTxnIdx) => nextCardTransactions[cardTxnIdx].identifier);
 
-      nextRepayments[repaymentIdx] = {
-        ...repayment,
+      Object.assign(repayment, {
         matchedAmount: bundledAmount,
         remainingAmount,
         linkedExpenseCount: unlinkedExpenseIndexes.length,
         linkedExpenseTxnIds,
         status: 'matched',
         matchSource: 'inferred_amount_cycle',
-      };
+      });
 
       for (const cardTxnIdx of unlinkedExpenseIndexes) {
-        const cardTxn = nextCardTransactions[cardTxnIdx];
-        nextCardTransactions[cardTxnIdx] = {
-          ...cardTxn,
+        Object.assign(nextCardTransactions[cardTxnIdx], {
           linkedRepaymentCount: 1,
           linkedRepaymentIds: [repayment.identifier],
           isLinked: true,
           linkMethod: 'inferred_amount_cycle',
-        };
+        });
       }
     }
   }
@@ -534,6 +553,7 @@ async function getPairingMatchDetails(params = {}) {
       ccVendor: pairing.creditCardVendor,
       ccAccountNumber: pairing.creditCardAccountNumber,
       monthsBack,
+      discrepancyAcknowledged: pairing.discrepancyAcknowledged,
     });
 
     const baseCycles = Array.isArray(discrepancy?.cycles)
@@ -12,7 +12,13 @@ function buildSqlInList(values) {
   return values.map((value) => `'${escapeSqlString(value)}'`).join(', ');
 }
 
+const categoryConditionCache = new Map();
+
 function getCreditCardRepaymentCategoryCondition(alias = 'cd') {
+  if (categoryConditionCache.has(alias)) {
+    return categoryConditionCache.get(alias);
+  }
+
   const predicates = [];
   if (CREDIT_CARD_REPAYMENT_CATEGORY_MATCH.name.length > 0) {
     predicates.push(`${alias}.name IN (${buildSqlInList(CREDIT_CARD_REPAYMENT_CATEGORY_MATCH.name)})`);
@@ -23,7 +29,9 @@ function getCreditCardRepaymentCategoryCondition(alias = 'cd') {
   if (CREDIT_CARD_REPAYMENT_CATEGORY_MATCH.name_fr.length > 0) {
     predicates.push(`${alias}.name_fr IN (${buildSqlInList(CREDIT_CARD_REPAYMENT_CATEGORY_MATCH.name_fr)})`);
   }
-  return predicates.length > 0 ? `(${predicates.join(' OR ')})` : '(0)';
+  const condition = predicates.length > 0 ? `(${predicates.join(' OR ')})` : '(0)';
+  categoryConditionCache.set(alias, condition);
+  return condition;
 }
 
 /**
@@ -34,23 +34,39 @@ async function getBankVendors() {
   return cachedBankVendors;
 }
 
-function matchesPairing(transaction, pairing) {
-  if (transaction.vendor !== pairing.bankVendor) {
-    return false;
-  }
+function escapeRegExp(value) {
+  return String(value).replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+}
 
-  if (pairing.bankAccountNumber && transaction.accountNumber !== pairing.bankAccountNumber) {
+/**
+ * Precompute per-pairing matchers once per filter pass: the lowercased match
+ * patterns are folded into a single alternation regex instead of lowercasing
+ * and scanning every pattern for every transaction/pairing combination.
+ */
+function buildPairingMatchers(activePairings) {
+  return activePairings
+    .filter((pairing) => pairing.matchPatterns && pairing.matchPatterns.length > 0)
+    .map((pairing) => ({
+      bankVendor: pairing.bankVendor,
+      bankAccountNumber: pairing.bankAccountNumber,
+      namePattern: new RegExp(
+        pairing.matchPatterns
+          .map((pattern) => escapeRegExp(String(pattern || '').toLowerCase()))
+          .join('|'),
+      ),
+    }));
+}
+
+function matchesPairing(transaction, matcher) {
+  if (transaction.vendor !== matcher.bankVendor) {
     return false;
   }
 
-  if (!pairing.matchPatterns || pairing.matchPatterns.length === 0) {
+  if (matcher.bankAccountNumber && transaction.accountNumber !== matcher.bankAccountNumber) {
     return false;
   }
 
-  const txnNameLower = (transaction.name || '').toLowerCase();
-  return pairing.matchPatterns.some((pattern) =>
-    txnNameLower.includes(String(pattern || '').toLowerCase()),
-  );
+  return matcher.namePattern.test(transaction.nameLower);
 }
 
 function filterUnpairedTransactions(transactions, activePairings) {
@@ -58,14 +74,28 @@ function filterUnpairedTransactions(transactions, activePairings) {
     return transactions;
   }
 
+  // Index matchers by bank vendor so each transaction only checks its own vendor's pairings
+  const matchersByVendor = new Map();
+  for (const matcher of buildPairingMatchers(activePairings)) {
+    if (!matchersByVendor.has(matcher.bankVendor)) {
+      matchersByVendor.set(matcher.bankVendor, []);
+    }
+    matchersByVendor.get(matcher.bankVendor).push(matcher);
+  }
+
   return transactions.filter((txn) => {
+    const matchers = matchersByVendor.get(txn.vendor);
+    if (!matchers) {
+      return true;
+    }
+
     const normalizedTxn = {
       vendor: txn.vendor,
       accountNumber: txn.account_number,
-      name: txn.name,
+      nameLower: (txn.name || '').toLowerCase(),
     };
 
-    return !activePairings.some((pairing) => matchesPairing(normalizedTxn, pairing));
+    return !matchers.some((matcher) => matchesPairing(normalizedTxn, matcher));
   });
 }
 
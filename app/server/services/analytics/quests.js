@@ -251,7 +251,8 @@ const STABLE_MIN_SPEND_SHARE = 0.6;
 function median(values) {
   if (!Array.isArray(values) || values.length === 0) return 0;
 
-  const sorted = values.slice().sort((a, b) => a - b);
+  // Typed-array sort is numeric and native, with no comparator callback per comparison
+  const sorted = Float64Array.from(values).sort();
   const mid = Math.floor(sorted.length / 2);
 
   if (sorted.length % 2 === 0) {
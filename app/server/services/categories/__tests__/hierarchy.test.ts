@@ -1,6 +1,7 @@
 import { afterEach, beforeAll, beforeEach, describe, expect, it, vi } from 'vitest';
 
 const modulePromise = import('../hierarchy.js');
+const autoPairingPromise = import('../../accounts/auto-pairing.js');
 
 const queryMock = vi.fn();
 const clientQueryMock = vi.fn();
@@ -273,6 +274,28 @@ describe('hierarchy service', () => {
       expect(result.name).toBe('New Name');
     });
 
+    it('clears the cached CC fees category id after a rename', async () => {
+      const autoPairingModule = await autoPairingPromise;
+      const autoPairingService = autoPairingModule.default ?? autoPairingModule;
+      const feesClient = { query: vi.fn() };
+      feesClient.query
+        .mockResolvedValueOnce({ rows: [{ id: 5 }] })
+        .mockResolvedValueOnce({ rows: [{ id: 8 }] });
+      autoPairingService.__setDatabase({ getClient: getClientMock });
+      queryMock.mockResolvedValueOnce({
+        rows: [{ id: 8, name: 'עמלות בנק וכרטיס', category_type: 'expense' }],
+      });
+
+      try {
+        await expect(autoPairingService._internal.getCCFeesCategoryId(feesClient)).resolves.toBe(5);
+        await hierarchyService.updateCategory({ id: 8, name: 'עמלות בנק וכרטיס' });
+        await expect(autoPairingService._internal.getCCFeesCategoryId(feesClient)).resolves.toBe(8);
+        expect(feesClient.query).toHaveBeenCalledTimes(2);
+      } finally {
+        autoPairingService.__resetDatabase();
+      }
+    });
+
     it('throws 400 for missing category ID', async () => {
       await expect(
         hierarchyService.updateCategory({ name: 'Test' })
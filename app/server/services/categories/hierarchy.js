@@ -1,4 +1,5 @@
 const database = require('../database.js');
+const { resetCCFeesCategoryCache } = require('../accounts/auto-pairing.js');
 
 function serviceError(status, message) {
   const error = new Error(message);
@@ -278,6 +279,7 @@ async function createCategory(payload = {}) {
   );
 
   newCategory.hierarchy_path = hierarchyPath;
+  resetCCFeesCategoryCache();
   return newCategory;
 }
 
@@ -349,6 +351,7 @@ async function updateCategory(payload = {}) {
   if (result.rows.length === 0) {
     throw serviceError(404, 'Category not found');
   }
+  resetCCFeesCategoryCache();
 
   return result.rows[0];
 }
@@ -388,6 +391,7 @@ async function deleteCategory(params = {}) {
   if (result.rows.length === 0) {
     throw serviceError(404, 'Category not found');
   }
+  resetCCFeesCategoryCache();
 
   return { message: 'Category deleted successfully', category: result.rows[0] 
 };
@@ -2,6 +2,7 @@ const actualDatabase = require('../database.js');
 const { resolveCategory: actualResolveCategory } = require('../../../lib/category-helpers.js');
 const { BANK_CATEGORY_NAME } = require('../../../lib/category-constants.js');
 const { dialect } = require('../../../lib/sql-dialect.js');
+const { resetEarliestCCCycleDateCache } = require('../accounts/auto-pairing.js');
 
 const CONFIDENCE_UPDATE_EXPR = dialect.useSqlite
   ? 'CASE WHEN confidence_score IS NULL OR confidence_score < $3 THEN $3 ELSE confidence_score END'
@@ -114,6 +115,7 @@ async function categorizeTransaction(payload = {}) {
         error.status = 404;
         throw error;
       }
+      resetEarliestCCCycleDateCache();
 
       return {
         success: true,
@@ -226,6 +228,9 @@ async function bulkCategorizeTransactions(providedClient = null) {
 
       totalUpdated += Number(updateResult.rowCount || 0);
     }
+    if (totalUpdated > 0) {
+      resetEarliestCCCycleDateCache();
+    }
 
     return {
       patternsApplied: patterns.length,
@@ -1,6 +1,7 @@
 const actualDatabase = require('../database.js');
 const { BANK_CATEGORY_NAME } = require('../../../lib/category-constants.js');
 const { dialect } = require('../../../lib/sql-dialect.js');
+const { resetEarliestCCCycleDateCache } = require('../accounts/auto-pairing.js');
 
 let database = actualDatabase;
 
@@ -318,6 +319,9 @@ async function createAutoRule(payload = {}) {
   );
 
   const transactionsUpdated = updateResult.rowCount || 0;
+  if (transactionsUpdated > 0) {
+    resetEarliestCCCycleDateCache();
+  }
 
   return {
     success: true,
@@ -522,6 +526,9 @@ async function applyCategorizationRules() {
 
       totalUpdated += updateResult.rowCount;
     }
+    if (totalUpdated > 0) {
+      resetEarliestCCCycleDateCache();
+    }
 
     return {
       success: true,
@@ -2,6 +2,7 @@ const actualDatabase = require('./database.js');
 const encryptionUtils = require('../../lib/server/encryption.js');
 const institutionsModule = require('./institutions.js');
 const timeUtils = require('../../lib/server/time-utils.js');
+const { resetEarliestCCCycleDateCache } = require('./accounts/auto-pairing.js');
 
 let database = actualDatabase;
 let encryptRef = encryptionUtils.encrypt;
@@ -526,6 +527,7 @@ async function deleteCredential(params = {}) {
     );
 
     await client.query('COMMIT');
+    resetEarliestCCCycleDateCache();
   } catch (err) {
     await client.query('ROLLBACK');
     throw err;
@@ -9,16 +9,20 @@ let standardizeErrorRef = queryUtils.standardizeError;
 const VALID_FORMATS = new Set(['csv', 'json']);
 const VALID_DATA_TYPES = new Set(['transactions', 'categories', 'vendors', 'budgets', 'full']);
 
+const CSV_SPECIAL_CHARS = /[",\n]/;
+const CSV_QUOTE = /"/g;
+
 function escapeCSV(field) {
   if (field === null || field === undefined) return '';
+  if (typeof field === 'number') return String(field);
   const str = String(field);
-  if (str.includes(',') || str.includes('"') || str.includes('\n')) {
-    return `"${str.replace(/"/g, '""')}"`;
+  if (CSV_SPECIAL_CHARS.test(str)) {
+    return `"${str.replace(CSV_QUOTE, '""')}"`;
   }
   return str;
 }
 
-function formatTransactionsCSV(transactions = [], includeInstitutions = true) {
+function appendTransactionsCSV(csvRows, transactions = [], includeInstitutions = true) {
   const headers = [
     'Date',
     'Vendor',
@@ -35,7 +39,7 @@ function formatTransactionsCSV(transactions = [], includeInstitutions = true) {
     headers.push('Institution', 'Institution Type');
   }
 
-  const csvRows = [headers.join(',')];
+  csvRows.push(headers.join(','));
 
   transactions.forEach((txn) => {
     const row = [
@@ -62,13 +66,11 @@ function formatTransactionsCSV(transactions = [], includeInstitutions = true) {
     }
     csvRows.push(row.join(','));
   });
-
-  return csvRows.join('\n');
 }
 
-function formatCategoriesCSV(categories = []) {
+function appendCategoriesCSV(csvRows, categories = []) {
   const headers = ['Category', 'Parent Category', 'Transaction Count', 'Total Amount'];
-  const csvRows = [headers.join(',')];
+  csvRows.push(headers.join(','));
 
   categories.forEach((cat) => {
     const row = [
@@ -79,11 +81,9 @@ function formatCategoriesCSV(categories = []) {
     ];
     csvRows.push(row.join(','));
   });
-
-  return csvRows.join('\n');
 }
 
-function formatVendorsCSV(vendors = [], includeInstitutions = true) {
+function appendVendorsCSV(csvRows, vendors = [], includeInstitutions = true) {
   const headers = [
     'Vendor',
     'Transaction Count',
@@ -95,7 +95,7 @@ function formatVendorsCSV(vendors = [], includeInstitutions = true) {
   if (includeInstitutions) {
     headers.splice(1, 0, 'Institution', 'Institution Type');
   }
-  const csvRows = [headers.join(',')];
+  csvRows.push(headers.join(','));
 
   vendors.forEach((vendor) => {
     const row = [
@@ -120,8 +120,6 @@ function formatVendorsCSV(vendors = [], includeInstitutions = true) {
     }
     csvRows.push(row.join(','));
   });
-
-  return csvRows.join('\n');
 }
 
 function buildInstitutionFromRow(row = {}) {
@@ -436,40 +434,40 @@ async function exportData(params = {}) {
   }
 
   if (format === 'csv') {
-    let csvContent = '';
+    // Every section appends its lines to one list, joined into the body once
+    const csvRows = [];
     let filename = `clarify-export-${dataType}-${timestamp}.csv`;
 
     if (dataType === 'transactions') {
-      csvContent = formatTransactionsCSV(exportData.transactions, includeInstitutionsFlag);
+      appendTransactionsCSV(csvRows, exportData.transactions, includeInstitutionsFlag);
     } else if (dataType === 'categories') {
-      csvContent = formatCategoriesCSV(exportData.categories);
+      appendCategoriesCSV(csvRows, exportData.categories);
     } else if (dataType === 'vendors') {
-      csvContent = formatVendorsCSV(exportData.vendors, includeInstitutionsFlag);
+      appendVendorsCSV(csvRows, exportData.vendors, includeInstitutionsFlag);
     } else if (dataType === 'full') {
-      const sections = [];
-
       if (exportData.transactions) {
-        sections.push('=== TRANSACTIONS ===');
-        sections.push(formatTransactionsCSV(exportData.transactions, includeInstitutionsFlag));
-        sections.push('');
+        csvRows.push('=== TRANSACTIONS ===');
+        appendTransactionsCSV(csvRows, exportData.transactions, includeInstitutionsFlag);
+        csvRows.push('');
       }
 
       if (exportData.categories) {
-        sections.push('=== CATEGORIES SUMMARY ===');
-        sections.push(formatCategoriesCSV(exportData.categories));
-        sections.push('');
+        csvRows.push('=== CATEGORIES SUMMARY ===');
+        appendCategoriesCSV(csvRows, exportData.categories);
+        csvRows.push('');
       }
 
       if (exportData.vendors) {
-        sections.push('=== VENDORS SUMMARY ===');
-        sections.push(formatVendorsCSV(exportData.vendors, includeInstitutionsFlag));
-        sections.push('');
+        csvRows.push('=== VENDORS SUMMARY ===');
+        appendVendorsCSV(csvRows, exportData.vendors, includeInstitutionsFlag);
+        csvRows.push('');
       }
 
-      csvContent = sections.join('\n');
       filename = `clarify-full-export-${timestamp}.csv`;
     }
 
+    const csvContent = csvRows.join('\n');
+
     return {
       format: 'csv',
       contentType: 'text/csv',
@@ -121,7 +121,8 @@ function mean(values) {
 
 function median(values) {
   if (values.length === 0) return 0;
-  const sorted = [...values].sort((a, b) => a - b);
+  // Typed-array sort is numeric and native, with no comparator callback per comparison
+  const sorted = Float64Array.from(values).sort();
   const middle = Math.floor(sorted.length / 2);
   if (sorted.length % 2 === 1) return sorted[middle];
   return (sorted[middle - 1] + sorted[middle]) / 2;
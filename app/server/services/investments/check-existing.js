@@ -10,7 +10,7 @@ let database = actualDatabase;
 
 async function getExistingInvestments() {
   const vendorResult = await database.query(
-    `SELECT DISTINCT
+    `SELECT
         t.vendor,
         t.name,
         cd.id as category_definition_id,
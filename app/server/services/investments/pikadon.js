@@ -4,6 +4,7 @@ const {
   buildPikadonCandidate,
   toIsoDateInTimeZone,
 } = require('./pikadon-candidates.js');
+const { resetEarliestCCCycleDateCache } = require('../accounts/auto-pairing.js');
 
 let database = actualDatabase;
 
@@ -68,9 +69,15 @@ function lower(value) {
   return String(value || '').toLowerCase();
 }
 
-function includesAny(text, keywords) {
+// Keyword lists lowercased once at load; includesAny only lowercases the text
+const LOWERED_PIKADON_KEYWORDS = PIKADON_KEYWORDS.map(lower);
+const LOWERED_PIKADON_RETURN_KEYWORDS = PIKADON_RETURN_KEYWORDS.map(lower);
+const LOWERED_PIKADON_INTEREST_KEYWORDS = PIKADON_INTEREST_KEYWORDS.map(lower);
+const LOWERED_PIKADON_TAX_KEYWORDS = PIKADON_TAX_KEYWORDS.map(lower);
+
+function includesAny(text, loweredKeywords) {
   const normalized = lower(text);
-  return keywords.some((keyword) => normalized.includes(lower(keyword)));
+  return loweredKeywords.some((keyword) => normalized.includes(keyword));
 }
 
 function buildTransactionHaystack(transaction) {
@@ -83,7 +90,7 @@ function buildTransactionHaystack(transaction) {
 }
 
 function transactionHasPikadonKeyword(transaction) {
-  return includesAny(buildTransactionHaystack(transaction), PIKADON_KEYWORDS);
+  return includesAny(buildTransactionHaystack(transaction), LOWERED_PIKADON_KEYWORDS);
 }
 
 function transactionLooksLikePikadonReturn(transaction) {
@@ -97,11 +104,11 @@ function transactionLooksLikePikadonReturn(transaction) {
     return false;
   }
 
-  if (includesAny(haystack, PIKADON_INTEREST_KEYWORDS)) {
+  if (includesAny(haystack, LOWERED_PIKADON_INTEREST_KEYWORDS)) {
     return false;
   }
 
-  return includesAny(haystack, PIKADON_RETURN_KEYWORDS);
+  return includesAny(haystack, LOWERED_PIKADON_RETURN_KEYWORDS);
 }
 
 function transactionLooksLikePikadonInterest(transaction) {
@@ -111,7 +118,7 @@ function transactionLooksLikePikadonInterest(transaction) {
   }
 
   return transactionHasPikadonKeyword(transaction)
-    && includesAny(buildTransactionHaystack(transaction), PIKADON_INTEREST_KEYWORDS);
+    && includesAny(buildTransactionHaystack(transaction), LOWERED_PIKADON_INTEREST_KEYWORDS);
 }
 
 function transactionLooksLikePikadonTax(transaction) {
@@ -124,7 +131,7 @@ function transactionLooksLikePikadonTax(transaction) {
     transactionHasPikadonKeyword(transaction)
     || lower(transaction?.category_name_en).includes('investment tax')
     || lower(transaction?.category_name).includes('מס על השקעות')
-  ) && includesAny(buildTransactionHaystack(transaction), PIKADON_TAX_KEYWORDS);
+  ) && includesAny(buildTransactionHaystack(transaction), LOWERED_PIKADON_TAX_KEYWORDS);
 }
 
 function toFiniteNumber(value) {
@@ -511,6 +518,7 @@ async function updateTransactionToCapitalReturn(transaction, dbAdapter = databas
     `,
     [categoryId, 0.95, transaction.identifier, transaction.vendor],
   );
+  resetEarliestCCCycleDateCache();
 
   return true;
 }
@@ -921,29 +929,52 @@ async function listPikadon(params = {}) {
 
   const pikadonList = result.rows.map(parsePikadonRow);
 
-  // Optionally fetch linked transactions
+  // Optionally fetch linked transactions (one query for every holding's deposit/return)
   if (includeTransactions && pikadonList.length > 0) {
+    const identifiers = new Set();
+    const vendors = new Set();
     for (const pikadon of pikadonList) {
       pikadon.deposit_transaction = null;
       pikadon.return_transaction = null;
 
       if (pikadon.deposit_transaction_id && pikadon.deposit_transaction_vendor) {
-        const depositTxn = await database.query(
-          'SELECT * FROM transactions WHERE identifier = $1 AND vendor = $2',
-          [pikadon.deposit_transaction_id, pikadon.deposit_transaction_vendor]
-        );
-        if (depositTxn.rows.length > 0) {
-          pikadon.deposit_transaction = depositTxn.rows[0];
+        identifiers.add(pikadon.deposit_transaction_id);
+        vendors.add(pikadon.deposit_transaction_vendor);
+      }
+      if (pikadon.return_transaction_id && pikadon.return_transaction_vendor) {
+        identifiers.add(pikadon.return_transaction_id);
+        vendors.add(pikadon.return_transaction_vendor);
+      }
+    }
+
+    if (identifiers.size > 0) {
+      const idParams = Array.from(identifiers);
+      const vendorParams = Array.from(vendors);
+      const idPlaceholders = idParams.map((_, i) => `$${i + 1}`).join(', ');
+      const vendorPlaceholders = vendorParams.map((_, i) => `$${idParams.length + i + 1}`).join(', ');
+      const linkedResult = await database.query(
+        `SELECT * FROM transactions WHERE identifier IN (${idPlaceholders}) AND vendor IN (${vendorPlaceholders})`,
+        [...idParams, ...vendorParams]
+      );
+
+      const transactionsByKey = new Map();
+      for (const row of linkedResult.rows) {
+        const key = `${row.identifier}|${row.vendor}`;
+        if (!transactionsByKey.has(key)) {
+          transactionsByKey.set(key, row);
         }
       }
 
-      if (pikadon.return_transaction_id && pikadon.return_transaction_vendor) {
-        const returnTxn = await database.query(
-          'SELECT * FROM transactions WHERE identifier = $1 AND vendor = $2',
-          [pikadon.return_transaction_id, pikadon.return_transaction_vendor]
-        );
-        if (returnTxn.rows.length > 0) {
-          pikadon.return_transaction = returnTxn.rows[0];
+      for (const pikadon of pikadonList) {
+        if (pikadon.deposit_transaction_id && pikadon.deposit_transaction_vendor) {
+          pikadon.deposit_transaction = transactionsByKey.get(
+            `${pikadon.deposit_transaction_id}|${pikadon.deposit_transaction_vendor}`
+          ) || null;
+        }
+        if (pikadon.return_transaction_id && pikadon.return_transaction_vendor) {
+          pikadon.return_transaction = transactionsByKey.get(
+            `${pikadon.return_transaction_id}|${pikadon.return_transaction_vendor}`
+          ) || null;
         }
       }
     }
@@ -1177,6 +1208,39 @@ async function linkReturnTransaction(pikadonId, payload = {}) {
   };
 }
 
+/**
+ * Position in `order` (indexes sorted by ascending `times`) of the first entry
+ * whose time is after `time`
+ */
+function findFirstIndexAfter(order, times, time) {
+  let low = 0;
+  let high = order.length;
+  while (low < high) {
+    const mid = (low + high) >>> 1;
+    if (times[order[mid]] <= time) {
+      low = mid + 1;
+    } else {
+      high = mid;
+    }
+  }
+  return low;
+}
+
+// Position of the first entry in `order` whose time is >= `time`
+function findFirstIndexAtOrAfter(order, times, time) {
+  let low = 0;
+  let high = order.length;
+  while (low < high) {
+    const mid = (low + high) >>> 1;
+    if (times[order[mid]] < time) {
+      low = mid + 1;
+    } else {
+      high = mid;
+    }
+  }
+  return low;
+}
+
 /**
  * Detect potential pikadon deposit/return pairs from transactions
  */
@@ -1202,6 +1266,13 @@ async function detectPikadonPairs(params = {}) {
         ${keywordPatterns.map((_, i) => `LOWER(t.name) LIKE LOWER($${i + 1})`).join(' OR ')}
         OR ${keywordPatterns.map((_, i) => `LOWER(t.memo) LIKE LOWER($${i + 1})`).join(' OR ')}
       )
+      AND NOT EXISTS (
+        SELECT 1
+        FROM investment_holdings ih
+        WHERE ih.holding_type = 'pikadon'
+          AND ih.deposit_transaction_id = t.identifier
+          AND ih.deposit_transaction_vendor = t.vendor
+      )
   `;
 
   const depositParams = [...keywordPatterns];
@@ -1240,6 +1311,13 @@ async function detectPikadonPairs(params = {}) {
         ${keywordPatterns.map((_, i) => `LOWER(t.name) LIKE LOWER($${i + 1})`).join(' OR ')}
         OR ${keywordPatterns.map((_, i) => `LOWER(t.memo) LIKE LOWER($${i + 1})`).join(' OR ')}
       )
+      AND NOT EXISTS (
+        SELECT 1
+        FROM investment_holdings ih
+        WHERE ih.holding_type = 'pikadon'
+          AND ih.return_transaction_id = t.identifier
+          AND ih.return_transaction_vendor = t.vendor
+      )
   `;
 
   const returnParams = [...keywordPatterns];
@@ -1262,54 +1340,66 @@ async function detectPikadonPairs(params = {}) {
 
   const returnResult = await database.query(returnQuery, returnParams);
 
-  // Check which transactions are already linked to pikadon
-  const linkedDeposits = await database.query(`
-    SELECT deposit_transaction_id, deposit_transaction_vendor
-    FROM investment_holdings
-    WHERE holding_type = 'pikadon'
-      AND deposit_transaction_id IS NOT NULL
-  `);
-
-  const linkedReturns = await database.query(`
-    SELECT return_transaction_id, return_transaction_vendor
-    FROM investment_holdings
-    WHERE holding_type = 'pikadon'
-      AND return_transaction_id IS NOT NULL
-  `);
-
-  const linkedDepositSet = new Set(
-    linkedDeposits.rows.map((r) => `${r.deposit_transaction_id}|${r.deposit_transaction_vendor}`)
-  );
-  const linkedReturnSet = new Set(
-    linkedReturns.rows.map((r) => `${r.return_transaction_id}|${r.return_transaction_vendor}`)
-  );
-
-  // Filter out already linked transactions
-  const unlinkedDeposits = depositResult.rows.filter(
-    (t) => !linkedDepositSet.has(`${t.identifier}|${t.vendor}`)
-  );
-  const unlinkedReturns = returnResult.rows.filter(
-    (t) => !linkedReturnSet.has(`${t.identifier}|${t.vendor}`)
-  );
+  // Transactions already linked to a pikadon are excluded by the NOT EXISTS filters
+  const unlinkedDeposits = depositResult.rows;
+  const unlinkedReturns = returnResult.rows;
 
   // Match deposits with returns
   const suggestions = [];
 
-  for (const deposit of unlinkedDeposits) {
-    const depositAmount = Math.abs(Number.parseFloat(deposit.price));
-    const depositDate = new Date(deposit.date);
+  // Returns ordered by date so each deposit's 13-month window is found by binary
+  // search instead of scanning every return (undated ones always pass the date checks)
+  const returnTimes = unlinkedReturns.map((ret) => new Date(ret.date).getTime());
+  const returnAmounts = unlinkedReturns.map((ret) => Number.parseFloat(ret.price));
+  // Deposit dates/amounts are parsed once and shared with the rollover pass below
+  const depositTimes = unlinkedDeposits.map((dep) => new Date(dep.date).getTime());
+  const depositAmounts = unlinkedDeposits.map((dep) => Math.abs(Number.parseFloat(dep.price)));
+  const datedDepositOrder = [];
+  const undatedDepositIndexes = [];
+  depositTimes.forEach((time, idx) => {
+    (Number.isNaN(time) ? undatedDepositIndexes : datedDepositOrder).push(idx);
+  });
+  datedDepositOrder.sort((a, b) => depositTimes[a] - depositTimes[b]);
+  const datedReturnOrder = [];
+  const undatedReturnIndexes = [];
+  returnTimes.forEach((time, idx) => {
+    (Number.isNaN(time) ? undatedReturnIndexes : datedReturnOrder).push(idx);
+  });
+  datedReturnOrder.sort((a, b) => returnTimes[a] - returnTimes[b]);
+
+  unlinkedDeposits.forEach((deposit, depositIdx) => {
+    const depositAmount = depositAmounts[depositIdx];
+    const depositTime = depositTimes[depositIdx];
+
+    let windowReturnIndexes;
+    if (Number.isNaN(depositTime)) {
+      windowReturnIndexes = unlinkedReturns.map((_, idx) => idx);
+    } else {
+      windowReturnIndexes = [...undatedReturnIndexes];
+      for (
+        let pos = findFirstIndexAfter(datedReturnOrder, returnTimes, depositTime);
+        pos < datedReturnOrder.length;
+        pos += 1
+      ) {
+        const idx = datedReturnOrder[pos];
+        if ((returnTimes[idx] - depositTime) / (1000 * 60 * 60 * 24 * 30) > 13) break;
+        windowReturnIndexes.push(idx);
+      }
+      // Back to query order, so equal-confidence matches keep their ranking
+      windowReturnIndexes.sort((a, b) => a - b);
+    }
 
     // Find potential matching returns
-    const matchingReturns = unlinkedReturns
-      .filter((ret) => {
-        const returnAmount = Number.parseFloat(ret.price);
-        const returnDate = new Date(ret.date);
+    const matchingReturns = windowReturnIndexes
+      .filter((idx) => {
+        const returnAmount = returnAmounts[idx];
+        const returnTime = returnTimes[idx];
 
         // Return must be after deposit
-        if (returnDate <= depositDate) return false;
+        if (returnTime <= depositTime) return false;
 
         // Return should be within 13 months
-        const monthsDiff = (returnDate - depositDate) / (1000 * 60 * 60 * 24 * 30);
+        const monthsDiff = (returnTime - depositTime) / (1000 * 60 * 60 * 24 * 30);
         if (monthsDiff > 13) return false;
 
         // Return amount should be 100-115% of deposit (allowing for interest)
@@ -1319,12 +1409,12 @@ async function detectPikadonPairs(params = {}) {
         // Prefer same vendor
         return true;
       })
-      .map((ret) => {
-        const returnAmount = Number.parseFloat(ret.price);
+      .map((idx) => {
+        const ret = unlinkedReturns[idx];
+        const returnAmount = returnAmounts[idx];
         const interest = returnAmount - depositAmount;
         const interestRate = (interest / depositAmount) * 100;
-        const returnDate = new Date(ret.date);
-        const monthsDiff = (returnDate - depositDate) / (1000 * 60 * 60 * 24 * 30);
+        const monthsDiff = (returnTimes[idx] - depositTime) / (1000 * 60 * 60 * 24 * 30);
 
         // Calculate confidence score
         let confidence = 0.5;
@@ -1353,7 +1443,7 @@ async function detectPikadonPairs(params = {}) {
       potential_returns: matchingReturns,
       best_match: matchingReturns[0] || null,
     });
-  }
+  });
 
   // Also include unmatched returns (orphan returns)
   const matchedReturnIds = new Set();
@@ -1373,14 +1463,31 @@ async function detectPikadonPairs(params = {}) {
   for (const suggestion of suggestions) {
     if (!suggestion.best_match) continue;
 
-    const returnDate = new Date(suggestion.best_match.return_transaction.date);
+    const returnTime = new Date(suggestion.best_match.return_transaction.date).getTime();
     const returnAmount = suggestion.best_match.return_amount;
 
+    let windowDepositIndexes;
+    if (Number.isNaN(returnTime)) {
+      windowDepositIndexes = unlinkedDeposits.map((_, idx) => idx);
+    } else {
+      windowDepositIndexes = [...undatedDepositIndexes];
+      for (
+        let pos = findFirstIndexAtOrAfter(datedDepositOrder, depositTimes, returnTime);
+        pos < datedDepositOrder.length;
+        pos += 1
+      ) {
+        const idx = datedDepositOrder[pos];
+        if ((depositTimes[idx] - returnTime) / (1000 * 60 * 60 * 24) > 7) break;
+        windowDepositIndexes.push(idx);
+      }
+      windowDepositIndexes.sort((a, b) => a - b);
+    }
+
     // Find deposits that occur within 7 days after this return
-    const potentialRollovers = unlinkedDeposits
-      .filter((dep) => {
-        const depDate = new Date(dep.date);
-        const daysDiff = (depDate - returnDate) / (1000 * 60 * 60 * 24);
+    const potentialRollovers = windowDepositIndexes
+      .filter((idx) => {
+        const dep = unlinkedDeposits[idx];
+        const daysDiff = (depositTimes[idx] - returnTime) / (1000 * 60 * 60 * 24);
 
         // Deposit should be within 7 days after return
         if (daysDiff < 0 || daysDiff > 7) return false;
@@ -1392,10 +1499,10 @@ async function detectPikadonPairs(params = {}) {
         // Same vendor/account preferred
         return true;
       })
-      .map((dep) => {
-        const newDepositAmount = Math.abs(Number.parseFloat(dep.price));
-        const depDate = new Date(dep.date);
-        const daysDiff = (depDate - returnDate) / (1000 * 60 * 60 * 24);
+      .map((idx) => {
+        const dep = unlinkedDeposits[idx];
+        const newDepositAmount = depositAmounts[idx];
+        const daysDiff = (depositTimes[idx] - returnTime) / (1000 * 60 * 60 * 24);
 
         // Calculate reinvestment details
         const originalPrincipal = suggestion.deposit_amount;
@@ -1913,6 +2020,11 @@ async function autoDetectPikadonEvents(params = {}) {
         tax_paid: [],
         new_deposits: [],
         all_transactions: [],
+        // Running totals, accumulated in the same order the rows are pushed
+        principal_total: 0,
+        interest_total: 0,
+        tax_total: 0,
+        deposit_total: 0,
       });
     }
 
@@ -1925,12 +2037,17 @@ async function autoDetectPikadonEvents(params = {}) {
     // Categorize transaction
     if (transactionLooksLikePikadonReturn(txn)) {
       event.principal_returns.push({ ...txn, amount: price });
+      event.principal_total += price;
     } else if (transactionLooksLikePikadonInterest(txn)) {
       event.interest_earned.push({ ...txn, amount: price });
+      event.interest_total += price;
     } else if (transactionLooksLikePikadonTax(txn)) {
       event.tax_paid.push({ ...txn, amount: price });
+      event.tax_total += price;
     } else if (name.includes('הפקדה')) {
-      event.new_deposits.push({ ...txn, amount: Math.abs(price) });
+      const depositAmount = Math.abs(price);
+      event.new_deposits.push({ ...txn, amount: depositAmount });
+      event.deposit_total += depositAmount;
     }
   });
 
@@ -1939,10 +2056,10 @@ async function autoDetectPikadonEvents(params = {}) {
   const depositEvents = [];
 
   for (const [dateKey, event] of eventsByDate) {
-    const totalPrincipal = event.principal_returns.reduce((sum, t) => sum + t.amount, 0);
-    const totalInterest = event.interest_earned.reduce((sum, t) => sum + t.amount, 0);
-    const totalTax = event.tax_paid.reduce((sum, t) => sum + t.amount, 0);
-    const totalDeposits = event.new_deposits.reduce((sum, t) => sum + t.amount, 0);
+    const totalPrincipal = event.principal_total;
+    const totalInterest = event.interest_total;
+    const totalTax = event.tax_total;
+    const totalDeposits = event.deposit_total;
 
     if (totalPrincipal > 0) {
       // This is a maturity event
@@ -1982,11 +2099,20 @@ async function autoDetectPikadonEvents(params = {}) {
   // Match deposits to maturities to build chains
   const chains = buildPikadonChains(maturityEvents, depositEvents);
 
-  // Calculate totals
+  // Calculate totals in a single pass over the maturity events
+  let totalInterestEarned = 0;
+  let totalTaxPaid = 0;
+  let totalPrincipalReturned = 0;
+  for (const event of maturityEvents) {
+    totalInterestEarned += event.interest_earned;
+    totalTaxPaid += event.tax_paid;
+    totalPrincipalReturned += event.principal_returned;
+  }
+
   const totals = {
-    total_interest_earned: maturityEvents.reduce((sum, e) => sum + e.interest_earned, 0),
-    total_tax_paid: maturityEvents.reduce((sum, e) => sum + e.tax_paid, 0),
-    total_principal_returned: maturityEvents.reduce((sum, e) => sum + e.principal_returned, 0),
+    total_interest_earned: totalInterestEarned,
+    total_tax_paid: totalTaxPaid,
+    total_principal_returned: totalPrincipalReturned,
     maturity_count: maturityEvents.length,
     active_deposits: chains.active_deposits,
     total_active_principal: chains.active_deposits.reduce((sum, d) => sum + d.amount, 0),
@@ -2114,212 +2240,232 @@ async function autoSetupPikadon(accountId, params = {}) {
   const created = [];
   const interestIncomeCreated = [];
   const transactionsToMark = []; // Collect all transaction IDs to mark as pikadon-related
+  let investmentInterestCategoryId;
 
-  // Process chains in chronological order
-  for (const chain of detected.chains) {
-    // Collect all transactions from this chain to mark
-    chain.maturity_event.transactions.forEach((txn) => {
-      transactionsToMark.push({ identifier: txn.identifier, vendor: txn.vendor });
-    });
-    transactionsToMark.push({
-      identifier: chain.start_deposit.transaction.identifier,
-      vendor: chain.start_deposit.transaction.vendor,
-    });
-
-    // Create the initial deposit
-    const depositResult = await database.query(
-      `
-      INSERT INTO investment_holdings (
-        account_id, current_value, cost_basis, as_of_date,
-        holding_type, deposit_transaction_id, deposit_transaction_vendor,
-        maturity_date, status, notes
-      ) VALUES ($1, $2, $3, $4, 'pikadon', $5, $6, $7, $8, $9)
-      RETURNING id
-      `,
-      [
-        accountId,
-        chain.maturity_event.principal_returned + chain.maturity_event.interest_earned,
-        chain.start_deposit.amount,
-        chain.start_deposit.date,
-        chain.start_deposit.transaction.identifier,
-        chain.start_deposit.transaction.vendor,
-        chain.maturity_event.date,
-        chain.rollover_deposit ? 'rolled_over' : 'matured',
-        `Auto-created: ${chain.start_deposit.name}`,
-      ]
-    );
+  // All holdings, interest entries and transaction flags are written in one transaction
+  const client = await database.getClient();
 
-    const pikadonId = depositResult.rows[0].id;
+  try {
+    await client.query('BEGIN');
 
-    // Link the return transaction
-    await database.query(
-      `
-      UPDATE investment_holdings
-      SET
-        return_transaction_id = $1,
-        return_transaction_vendor = $2,
-        interest_rate = $3
-      WHERE id = $4
-      `,
-      [
-        chain.maturity_event.return_transactions[0]?.identifier,
-        chain.maturity_event.return_transactions[0]?.vendor,
-        (chain.interest_earned / chain.start_deposit.amount) * 100,
-        pikadonId,
-      ]
-    );
-
-    // Create synthetic interest income transaction
-    const netInterest = chain.interest_earned - chain.tax_paid;
-    if (netInterest > 0) {
-      const interestIdentifier = `pikadon_interest_${pikadonId}_${Date.now()}`;
+    // Process chains in chronological order
+    for (const chain of detected.chains) {
+      // Collect all transactions from this chain to mark
+      chain.maturity_event.transactions.forEach((txn) => {
+        transactionsToMark.push({ identifier: txn.identifier, vendor: txn.vendor });
+      });
+      transactionsToMark.push({
+        identifier: chain.start_deposit.transaction.identifier,
+        vendor: chain.start_deposit.transaction.vendor,
+      });
 
-      // Get the Investment Interest category ID
-      const categoryResult = await database.query(
-        `SELECT id FROM category_definitions WHERE name = 'ריבית מהשקעות' AND category_type = 'income' LIMIT 1`
+      // Create the initial deposit
+      const depositResult = await client.query(
+        `
+        INSERT INTO investment_holdings (
+          account_id, current_value, cost_basis, as_of_date,
+          holding_type, deposit_transaction_id, deposit_transaction_vendor,
+          maturity_date, status, notes
+        ) VALUES ($1, $2, $3, $4, 'pikadon', $5, $6, $7, $8, $9)
+        RETURNING id
+        `,
+        [
+          accountId,
+          chain.maturity_event.principal_returned + chain.maturity_event.interest_earned,
+          chain.start_deposit.amount,
+          chain.start_deposit.date,
+          chain.start_deposit.transaction.identifier,
+          chain.start_deposit.transaction.vendor,
+          chain.maturity_event.date,
+          chain.rollover_deposit ? 'rolled_over' : 'matured',
+          `Auto-created: ${chain.start_deposit.name}`,
+        ]
       );
-      const investmentInterestCategoryId = categoryResult.rows[0]?.id || null;
 
-      await database.query(
+      const pikadonId = depositResult.rows[0].id;
+
+      // Link the return transaction
+      await client.query(
         `
-        INSERT INTO transactions (
-          identifier, vendor, date, name, price, type, status,
-          memo, category_type, is_pikadon_related, category_definition_id
-        ) VALUES ($1, $2, $3, $4, $5, 'normal', 'completed', $6, 'income', 0, $7)
+        UPDATE investment_holdings
+        SET
+          return_transaction_id = $1,
+          return_transaction_vendor = $2,
+          interest_rate = $3
+        WHERE id = $4
         `,
         [
-          interestIdentifier,
-          'pikadon_interest',
-          chain.maturity_event.date,
-          `ריבית פיקדון - ${accountName}`,
-          netInterest,
-          `Pikadon interest (gross: ${chain.interest_earned}, tax: ${chain.tax_paid})`,
-          investmentInterestCategoryId,
+          chain.maturity_event.return_transactions[0]?.identifier,
+          chain.maturity_event.return_transactions[0]?.vendor,
+          (chain.interest_earned / chain.start_deposit.amount) * 100,
+          pikadonId,
         ]
       );
 
-      interestIncomeCreated.push({
-        identifier: interestIdentifier,
-        amount: netInterest,
-        date: chain.maturity_event.date,
-        gross_interest: chain.interest_earned,
-        tax_paid: chain.tax_paid,
+      // Create synthetic interest income transaction
+      const netInterest = chain.interest_earned - chain.tax_paid;
+      if (netInterest > 0) {
+        const interestIdentifier = `pikadon_interest_${pikadonId}_${Date.now()}`;
+
+        // Get the Investment Interest category ID (looked up once per run)
+        if (investmentInterestCategoryId === undefined) {
+          const categoryResult = await client.query(
+            `SELECT id FROM category_definitions WHERE name = 'ריבית מהשקעות' AND category_type = 'income' LIMIT 1`
+          );
+          investmentInterestCategoryId = categoryResult.rows[0]?.id || null;
+        }
+
+        await client.query(
+          `
+          INSERT INTO transactions (
+            identifier, vendor, date, name, price, type, status,
+            memo, category_type, is_pikadon_related, category_definition_id
+          ) VALUES ($1, $2, $3, $4, $5, 'normal', 'completed', $6, 'income', 0, $7)
+          `,
+          [
+            interestIdentifier,
+            'pikadon_interest',
+            chain.maturity_event.date,
+            `ריבית פיקדון - ${accountName}`,
+            netInterest,
+            `Pikadon interest (gross: ${chain.interest_earned}, tax: ${chain.tax_paid})`,
+            investmentInterestCategoryId,
+          ]
+        );
+
+        interestIncomeCreated.push({
+          identifier: interestIdentifier,
+          amount: netInterest,
+          date: chain.maturity_event.date,
+          gross_interest: chain.interest_earned,
+          tax_paid: chain.tax_paid,
+        });
+      }
+
+      created.push({
+        id: pikadonId,
+        type: 'matured',
+        amount: chain.start_deposit.amount,
+        interest: chain.interest_earned,
+        date: chain.start_deposit.date,
       });
+
+      // If rolled over, create the new deposit linked to the old one
+      if (chain.rollover_deposit) {
+        transactionsToMark.push({
+          identifier: chain.rollover_deposit.transaction.identifier,
+          vendor: chain.rollover_deposit.transaction.vendor,
+        });
+
+        const rolloverResult = await client.query(
+          `
+          INSERT INTO investment_holdings (
+            account_id, current_value, cost_basis, as_of_date,
+            holding_type, deposit_transaction_id, deposit_transaction_vendor,
+            status, parent_pikadon_id, notes
+          ) VALUES ($1, $2, $3, $4, 'pikadon', $5, $6, 'active', $7, $8)
+          RETURNING id
+          `,
+          [
+            accountId,
+            chain.rollover_deposit.amount,
+            chain.rollover_deposit.amount,
+            chain.rollover_deposit.date,
+            chain.rollover_deposit.transaction.identifier,
+            chain.rollover_deposit.transaction.vendor,
+            pikadonId,
+            `Auto-created rollover: ${chain.rollover_deposit.name}`,
+          ]
+        );
+
+        created.push({
+          id: rolloverResult.rows[0].id,
+          type: 'active_rollover',
+          amount: chain.rollover_deposit.amount,
+          date: chain.rollover_deposit.date,
+          parent_id: pikadonId,
+        });
+      }
     }
 
-    created.push({
-      id: pikadonId,
-      type: 'matured',
-      amount: chain.start_deposit.amount,
-      interest: chain.interest_earned,
-      date: chain.start_deposit.date,
-    });
+    // Create standalone active deposits (not part of any chain)
+    for (const deposit of detected.active_deposits) {
+      // Skip if already created as part of a chain
+      const alreadyCreated = created.some(
+        (c) => c.type === 'active_rollover' &&
+               deposit.transaction &&
+               c.date === deposit.date
+      );
+      if (alreadyCreated) continue;
 
-    // If rolled over, create the new deposit linked to the old one
-    if (chain.rollover_deposit) {
-      transactionsToMark.push({
-        identifier: chain.rollover_deposit.transaction.identifier,
-        vendor: chain.rollover_deposit.transaction.vendor,
-      });
+      if (deposit.transaction) {
+        transactionsToMark.push({
+          identifier: deposit.transaction.identifier,
+          vendor: deposit.transaction.vendor,
+        });
+      }
 
-      const rolloverResult = await database.query(
+      const result = await client.query(
         `
         INSERT INTO investment_holdings (
           account_id, current_value, cost_basis, as_of_date,
           holding_type, deposit_transaction_id, deposit_transaction_vendor,
-          status, parent_pikadon_id, notes
-        ) VALUES ($1, $2, $3, $4, 'pikadon', $5, $6, 'active', $7, $8)
+          status, notes
+        ) VALUES ($1, $2, $3, $4, 'pikadon', $5, $6, 'active', $7)
         RETURNING id
         `,
         [
           accountId,
-          chain.rollover_deposit.amount,
-          chain.rollover_deposit.amount,
-          chain.rollover_deposit.date,
-          chain.rollover_deposit.transaction.identifier,
-          chain.rollover_deposit.transaction.vendor,
-          pikadonId,
-          `Auto-created rollover: ${chain.rollover_deposit.name}`,
+          deposit.amount,
+          deposit.amount,
+          deposit.date,
+          deposit.transaction?.identifier,
+          deposit.transaction?.vendor,
+          `Auto-created: ${deposit.name || 'Standalone deposit'}`,
         ]
       );
 
       created.push({
-        id: rolloverResult.rows[0].id,
-        type: 'active_rollover',
-        amount: chain.rollover_deposit.amount,
-        date: chain.rollover_deposit.date,
-        parent_id: pikadonId,
+        id: result.rows[0].id,
+        type: 'active_standalone',
+        amount: deposit.amount,
+        date: deposit.date,
       });
     }
-  }
-
-  // Create standalone active deposits (not part of any chain)
-  for (const deposit of detected.active_deposits) {
-    // Skip if already created as part of a chain
-    const alreadyCreated = created.some(
-      (c) => c.type === 'active_rollover' &&
-             deposit.transaction &&
-             c.date === deposit.date
-    );
-    if (alreadyCreated) continue;
 
-    if (deposit.transaction) {
-      transactionsToMark.push({
-        identifier: deposit.transaction.identifier,
-        vendor: deposit.transaction.vendor,
-      });
+    // Mark standard holdings as superseded now that pikadon holdings exist.
+    // The standard holding was a summary-level placeholder created by the suggestion
+    // flow; individual pikadon holdings now provide the granular breakdown.
+    if (created.length > 0) {
+      await client.query(
+        `UPDATE investment_holdings
+         SET status = 'superseded'
+         WHERE account_id = $1
+           AND COALESCE(holding_type, 'standard') <> 'pikadon'
+           AND COALESCE(status, 'active') <> 'superseded'`,
+        [accountId]
+      );
     }
 
-    const result = await database.query(
-      `
-      INSERT INTO investment_holdings (
-        account_id, current_value, cost_basis, as_of_date,
-        holding_type, deposit_transaction_id, deposit_transaction_vendor,
-        status, notes
-      ) VALUES ($1, $2, $3, $4, 'pikadon', $5, $6, 'active', $7)
-      RETURNING id
-      `,
-      [
-        accountId,
-        deposit.amount,
-        deposit.amount,
-        deposit.date,
-        deposit.transaction?.identifier,
-        deposit.transaction?.vendor,
-        `Auto-created: ${deposit.name || 'Standalone deposit'}`,
-      ]
-    );
-
-    created.push({
-      id: result.rows[0].id,
-      type: 'active_standalone',
-      amount: deposit.amount,
-      date: deposit.date,
-    });
-  }
-
-  // Mark standard holdings as superseded now that pikadon holdings exist.
-  // The standard holding was a summary-level placeholder created by the suggestion
-  // flow; individual pikadon holdings now provide the granular breakdown.
-  if (created.length > 0) {
-    await database.query(
-      `UPDATE investment_holdings
-       SET status = 'superseded'
-       WHERE account_id = $1
-         AND COALESCE(holding_type, 'standard') <> 'pikadon'
-         AND COALESCE(status, 'active') <> 'superseded'`,
-      [accountId]
-    );
-  }
+    // Mark all related transactions as pikadon-related
+    for (const txn of transactionsToMark) {
+      if (txn.identifier && txn.vendor) {
+        await client.query(
+          `UPDATE transactions SET is_pikadon_related = 1 WHERE identifier = $1 AND vendor = $2`,
+          [txn.identifier, txn.vendor]
+        );
+      }
+    }
 
-  // Mark all related transactions as pikadon-related
-  for (const txn of transactionsToMark) {
-    if (txn.identifier && txn.vendor) {
-      await database.query(
-        `UPDATE transactions SET is_pikadon_related = 1 WHERE identifier = $1 AND vendor = $2`,
-        [txn.identifier, txn.vendor]
-      );
+    await client.query('COMMIT');
+    if (interestIncomeCreated.length > 0) {
+      resetEarliestCCCycleDateCache();
     }
+  } catch (error) {
+    await client.query('ROLLBACK');
+    throw error;
+  } finally {
+    client.release();
   }
 
   return {
@@ -12,6 +12,7 @@ const {
   syncBankBalanceToInvestmentsMock,
   forwardFillForCredentialMock,
   getCreditCardRepaymentCategoryIdMock,
+  resetEarliestCCCycleDateCacheMock,
   resolveCategoryMock,
   findCategoryByNameMock,
   getCategoryInfoMock,
@@ -27,6 +28,7 @@ const {
   syncBankBalanceToInvestmentsMock: vi.fn(),
   forwardFillForCredentialMock: vi.fn(),
   getCreditCardRepaymentCategoryIdMock: vi.fn(),
+  resetEarliestCCCycleDateCacheMock: vi.fn(),
   resolveCategoryMock: vi.fn(),
   findCategoryByNameMock: vi.fn(),
   getCategoryInfoMock: vi.fn(),
@@ -135,6 +137,10 @@ vi.mock('../../accounts/repayment-category.js', () => ({
   getCreditCardRepaymentCategoryId: getCreditCardRepaymentCategoryIdMock,
 }));
 
+vi.mock('../../accounts/auto-pairing.js', () => ({
+  resetEarliestCCCycleDateCache: resetEarliestCCCycleDateCacheMock,
+}));
+
 // Mock last-transaction-date
 vi.mock('../../accounts/last-transaction-date.js', () => ({
   getLastTransactionDate: getLastTransactionDateMock,
@@ -157,6 +163,7 @@ beforeEach(async () => {
   runExclusiveMock.mockReset();
   runExclusiveMock.mockImplementation((fn: () => Promise<any>) => fn());
   getLastTransactionDateMock.mockReset();
+  resetEarliestCCCycleDateCacheMock.mockReset();
   syncBankBalanceToInvestmentsMock.mockReset();
   forwardFillForCredentialMock.mockReset();
   getCreditCardRepaymentCategoryIdMock.mockReset();
@@ -1275,6 +1282,7 @@ describe('scraping run service', () => {
           logger,
         }),
       ).resolves.toEqual({ bankTransactions: 0 });
+      expect(resetEarliestCCCycleDateCacheMock).not.toHaveBeenCalled();
 
       mockClient.query.mockImplementation(async (sql: string) => {
         const normalized = String(sql);
@@ -1334,6 +1342,7 @@ describe('scraping run service', () => {
         expect.stringContaining('SET bank_account_number = $1'),
         ['111111', 'hapoalim', 7],
       );
+      expect(resetEarliestCCCycleDateCacheMock).toHaveBeenCalledTimes(1);
     });
 
     it('handles pending/completed duplicate transitions without inserting duplicate rows', async () => {
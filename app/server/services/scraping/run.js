@@ -22,6 +22,7 @@ const { syncBankBalanceToInvestments, forwardFillForCredential } = require('../i
 const { autoClosePikadonReturns } = require('../investments/pikadon.js');
 const { getCreditCardRepaymentCategoryId } = require('../accounts/repayment-category.js');
 const lastTransactionDateService = require('../accounts/last-transaction-date.js');
+const { resetEarliestCCCycleDateCache } = require('../accounts/auto-pairing.js');
 const { dialect } = require('../../../lib/sql-dialect.js');
 
 const DEFAULT_TIMEOUT = 120000; // 2 minutes
@@ -942,10 +943,14 @@ function getIsraelDateTimeParts(value) {
   };
 }
 
+function isMidnightParts(parts) {
+  return parts.hour === '00' && parts.minute === '00' && parts.second === '00';
+}
+
 function isIsraelMidnight(value) {
   const parts = getIsraelDateTimeParts(value);
   if (!parts) return false;
-  return parts.hour === '00' && parts.minute === '00' && parts.second === '00';
+  return isMidnightParts(parts);
 }
 
 function hasSameInstant(left, right) {
@@ -1026,7 +1031,8 @@ function isLikelyCompletedDuplicate(existingCandidate, transaction) {
     return true;
   }
 
-  return isIsraelMidnight(existingCandidate.transaction_datetime) || isIsraelMidnight(transaction.date);
+  // Reuse the formatted parts rather than running both timestamps through Intl again
+  return isMidnightParts(existingParts) || isMidnightParts(incomingParts);
 }
 
 async function mergeCompletedDuplicateTransaction(
@@ -1215,28 +1221,49 @@ async function reconcileRecentlyScrapedAccountDuplicates(
     return { duplicatePairsResolved: 0 };
   }
 
-  const pendingTransactions = lifecycleTransactions.filter((txn) => txn.status === 'pending');
+  // Candidates must have the exact same price, so bucket both sides by price once
+  // instead of filtering every pending/scraped row for each stored completed row
+  const groupByPrice = (rows, getPrice) => {
+    const groups = new Map();
+    for (const row of rows) {
+      const price = Number(getPrice(row));
+      if (Number.isNaN(price)) continue;
+      if (!groups.has(price)) {
+        groups.set(price, []);
+      }
+      groups.get(price).push(row);
+    }
+    return groups;
+  };
+  const pendingTransactionsByPrice = groupByPrice(
+    lifecycleTransactions.filter((txn) => txn.status === 'pending'),
+    (txn) => txn.price,
+  );
+  const scrapedCompletedByPrice = groupByPrice(
+    completedTransactionsFromScrape,
+    (txn) => getTransactionPrice(txn, isBank),
+  );
   const completedTransactions = lifecycleTransactions.filter((txn) => txn.status === 'completed');
   const usedPendingIdentifiers = new Set();
   let duplicatePairsResolved = 0;
 
   for (const completedTxn of completedTransactions) {
+    const completedPrice = Number(completedTxn.price);
     const matchingScrapedCompletedTxn = findMatchingScrapedCompletedTransaction(
       completedTxn,
-      completedTransactionsFromScrape,
+      scrapedCompletedByPrice.get(completedPrice) || [],
       isBank,
     );
     if (!matchingScrapedCompletedTxn) {
       continue;
     }
 
-    const matchingPendingCandidates = pendingTransactions.filter((candidate) => {
+    const matchingPendingCandidates = (pendingTransactionsByPrice.get(completedPrice) || []).filter((candidate) => {
       if (usedPendingIdentifiers.has(candidate.identifier)) {
         return false;
       }
 
       return (
-        Number(candidate.price) === Number(completedTxn.price) &&
         getAbsHoursDiff(candidate.transaction_datetime, completedTxn.transaction_datetime)
           <= PENDING_COMPLETED_MATCH_WINDOW_HOURS
       );
@@ -1863,6 +1890,11 @@ async function processScrapeResult(client, { options, credentials, result, isBan
 
   await updateVendorAccountNumbers(client, options, credentials, discoveredAccountNumbers, isBank);
 
+  // New card history can move a pairing's earliest cycle (and its early grace window)
+  if (totalTxns > 0) {
+    resetEarliestCCCycleDateCache();
+  }
+
   logger?.info?.(`[Scrape:${options.companyId}] Completed: ${bankTransactions} bank transactions, ${discoveredAccountNumbers.size} unique accounts`);
 
   return { bankTransactions };
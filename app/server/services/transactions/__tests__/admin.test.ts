@@ -1,5 +1,6 @@
 import { afterEach, beforeEach, describe, expect, it, vi } from 'vitest';
 import * as transactionsAdmin from '../admin.js';
+import autoPairingService from '../../accounts/auto-pairing.js';
 
 const client = { query: vi.fn(), release: vi.fn() };
 const db = { getClient: vi.fn(), query: vi.fn() };
@@ -191,4 +192,22 @@ describe('transactions admin service', () => {
     expect(String(sql)).toContain('DELETE FROM transactions');
     expect(params).toEqual(['abc', 'vendor']);
   });
+
+  it('clears the cached earliest card cycle after a transaction write', async () => {
+    const cycleClient = { query: vi.fn() };
+    cycleClient.query
+      .mockResolvedValueOnce({ rows: [{ min_date: '2024-10-01' }] })
+      .mockResolvedValueOnce({ rows: [{ min_date: '2024-11-01' }] });
+    const params = { ccVendor: 'isracard', ccAccountNumber: '5678', ccFeesCategoryId: null };
+    const { getEarliestCCCycleDate } = autoPairingService._internal;
+
+    autoPairingService.resetEarliestCCCycleDateCache();
+    await expect(getEarliestCCCycleDate(cycleClient, params)).resolves.toBe('2024-10-01');
+
+    db.query.mockResolvedValueOnce({ rows: [] });
+    await transactionsAdmin.deleteTransaction('abc|isracard');
+
+    await expect(getEarliestCCCycleDate(cycleClient, params)).resolves.toBe('2024-11-01');
+    expect(cycleClient.query).toHaveBeenCalledTimes(2);
+  });
 });
@@ -1,5 +1,6 @@
 const actualDatabase = require('../database.js');
 const { INCOME_ROOT_NAME } = require('../../../lib/category-constants.js');
+const { resetEarliestCCCycleDateCache } = require('../accounts/auto-pairing.js');
 
 let database = actualDatabase;
 function __setDatabase(mock) {
@@ -128,6 +129,7 @@ async function createManualTransaction(payload = {}) {
         timestamp,
       ],
     );
+    resetEarliestCCCycleDateCache();
 
     return { success: true };
   } finally {
@@ -177,6 +179,7 @@ async function updateTransaction(id, updates = {}) {
     `,
     params,
   );
+  resetEarliestCCCycleDateCache();
 
   return { success: true };
 }
@@ -191,6 +194,7 @@ async function deleteTransaction(id) {
     `,
     [identifier, vendor],
   );
+  resetEarliestCCCycleDateCache();
 
   return { success: true };
 }
@@ -133,7 +133,7 @@ async function getCategoryExpenses(params = {}) {
         FROM transactions t
         LEFT JOIN category_definitions cd ON cd.id = t.category_definition_id
         LEFT JOIN category_definitions parent ON parent.id = cd.parent_id
-        LEFT JOIN (SELECT DISTINCT transaction_identifier, transaction_vendor FROM transaction_pairing_exclusions) tpe
+        LEFT JOIN transaction_pairing_exclusions tpe
           ON t.identifier = tpe.transaction_identifier
           AND t.vendor = tpe.transaction_vendor
         ${whereSql ? `${whereSql} AND tpe.transaction_identifier IS NULL AND ${EXCLUDE_PIKADON}` : `WHERE tpe.transaction_identifier IS NULL AND ${EXCLUDE_PIKADON}`}
@@ -183,7 +183,7 @@ async function getCategoryExpenses(params = {}) {
       FROM transactions t
       LEFT JOIN category_definitions cd ON cd.id = t.category_definition_id
       LEFT JOIN category_definitions parent ON parent.id = cd.parent_id
-      LEFT JOIN (SELECT DISTINCT transaction_identifier, transaction_vendor FROM transaction_pairing_exclusions) tpe
+      LEFT JOIN transaction_pairing_exclusions tpe
         ON t.identifier = tpe.transaction_identifier
         AND t.vendor = tpe.transaction_vendor
       WHERE t.category_definition_id IN (SELECT id FROM category_tree)
@@ -238,7 +238,7 @@ async function getCategorySpendingTimeline(params = {}) {
               ${yearExpr} AS year,
               ${yearTrunc} AS year_sort
             FROM transactions t
-            LEFT JOIN (SELECT DISTINCT transaction_identifier, transaction_vendor FROM transaction_pairing_exclusions) tpe
+            LEFT JOIN transaction_pairing_exclusions tpe
               ON t.identifier = tpe.transaction_identifier
               AND t.vendor = tpe.transaction_vendor
             WHERE t.category_definition_id IN (SELECT id FROM category_tree)
@@ -274,7 +274,7 @@ async function getCategorySpendingTimeline(params = {}) {
             ${yearMonthExpr} AS year_month,
             ${monthTrunc} AS month_sort
           FROM transactions t
-          LEFT JOIN (SELECT DISTINCT transaction_identifier, transaction_vendor FROM transaction_pairing_exclusions) tpe
+          LEFT JOIN transaction_pairing_exclusions tpe
             ON t.identifier = tpe.transaction_identifier
             AND t.vendor = tpe.transaction_vendor
           WHERE t.category_definition_id IN (SELECT id FROM category_tree)
@@ -311,7 +311,7 @@ async function getCategorySpendingTimeline(params = {}) {
             ${yearExpr} AS year,
             ${yearTrunc} AS year_sort
           FROM transactions t
-          LEFT JOIN (SELECT DISTINCT transaction_identifier, transaction_vendor FROM transaction_pairing_exclusions) tpe
+          LEFT JOIN transaction_pairing_exclusions tpe
             ON t.identifier = tpe.transaction_identifier
             AND t.vendor = tpe.transaction_vendor
           WHERE t.category_definition_id IN (SELECT id FROM category_tree)
@@ -347,7 +347,7 @@ async function getCategorySpendingTimeline(params = {}) {
           ${yearMonthExpr} AS year_month,
           ${monthTrunc} AS month_sort
         FROM transactions t
-        LEFT JOIN (SELECT DISTINCT transaction_identifier, transaction_vendor FROM transaction_pairing_exclusions) tpe
+        LEFT JOIN transaction_pairing_exclusions tpe
           ON t.identifier = tpe.transaction_identifier
           AND t.vendor = tpe.transaction_vendor
         WHERE t.category_definition_id IN (SELECT id FROM category_tree)
@@ -391,7 +391,7 @@ async function getExpensesByMonth(params = {}) {
           ${yearTrunc} AS year_sort
         FROM transactions t
         JOIN category_definitions cd ON cd.id = t.category_definition_id
-        LEFT JOIN (SELECT DISTINCT transaction_identifier, transaction_vendor FROM transaction_pairing_exclusions) tpe
+        LEFT JOIN transaction_pairing_exclusions tpe
           ON t.identifier = tpe.transaction_identifier
           AND t.vendor = tpe.transaction_vendor
         WHERE cd.name != $2
@@ -420,7 +420,7 @@ async function getExpensesByMonth(params = {}) {
         ${monthTrunc} AS year_sort
       FROM transactions t
       JOIN category_definitions cd ON cd.id = t.category_definition_id
-      LEFT JOIN (SELECT DISTINCT transaction_identifier, transaction_vendor FROM transaction_pairing_exclusions) tpe
+      LEFT JOIN transaction_pairing_exclusions tpe
         ON t.identifier = tpe.transaction_identifier
         AND t.vendor = tpe.transaction_vendor
       WHERE cd.name != $2
@@ -472,7 +472,7 @@ async function getMonthByCategories(params = {}) {
         FROM transactions t
         LEFT JOIN category_definitions cd ON cd.id = t.category_definition_id
         LEFT JOIN category_definitions parent ON parent.id = cd.parent_id
-        LEFT JOIN (SELECT DISTINCT transaction_identifier, transaction_vendor FROM transaction_pairing_exclusions) tpe
+        LEFT JOIN transaction_pairing_exclusions tpe
           ON t.identifier = tpe.transaction_identifier
           AND t.vendor = tpe.transaction_vendor
         WHERE ${dialect.toChar('t.date', 'YYYY-MM')} = $1
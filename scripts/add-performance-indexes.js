@@ -58,6 +58,22 @@ function indexExists(indexName) {
   return !!result;
 }
 
+// Helper to drop an index that a newer one supersedes
+function dropIndexIfExists(indexName) {
+  if (!indexExists(indexName)) {
+    return false;
+  }
+
+  try {
+    db.exec(`DROP INDEX IF EXISTS ${indexName}`);
+    console.log(`  🗑️  Dropped superseded index: ${indexName}`);
+    return true;
+  } catch (error) {
+    console.error(`  ❌ Failed to drop index ${indexName}:`, error.message);
+    return false;
+  }
+}
+
 // Helper to create index if it doesn't exist
 function createIndexIfNotExists(indexName, sql) {
   if (indexExists(indexName)) {
@@ -185,6 +201,11 @@ if (createIndexIfNotExists('idx_holdings_active_account_date',
   `CREATE INDEX IF NOT EXISTS idx_holdings_active_account_date ON investment_holdings(account_id, as_of_date DESC) WHERE status = 'active'`
 )) createdCount++;
 
+// Investment holdings - linked pikadon return lookups (pikadon pair detection)
+if (createIndexIfNotExists('idx_investment_holdings_return_txn',
+  'CREATE INDEX IF NOT EXISTS idx_investment_holdings_return_txn ON investment_holdings(return_transaction_id, return_transaction_vendor)'
+)) createdCount++;
+
 console.log('\n🏷️  Category definitions indexes:');
 
 // Category definitions - parent category lookups (hierarchy queries)
@@ -223,6 +244,27 @@ if (createIndexIfNotExists('idx_notifications_created',
 
 console.log('\n🔍 Account pairings indexes:');
 
+// Transactions - vendor + account + billing cycle day (card pairing discrepancy CC totals)
+if (createIndexIfNotExists('idx_transactions_vendor_account_cycle_date',
+  'CREATE INDEX IF NOT EXISTS idx_transactions_vendor_account_cycle_date ON transactions(vendor, account_number, substr(COALESCE(processed_date, date), 1, 10))'
+)) createdCount++;
+
+// Transactions - completed debits by vendor + date (bank repayment range scans without an account)
+if (createIndexIfNotExists('idx_transactions_debits_vendor_date',
+  `CREATE INDEX IF NOT EXISTS idx_transactions_debits_vendor_date ON transactions(vendor, date) WHERE status = 'completed' AND price < 0`
+)) createdCount++;
+
+// Transactions - completed debits by vendor + account + date (bank repayment range scans for one account)
+if (createIndexIfNotExists('idx_transactions_debits_vendor_account_date',
+  `CREATE INDEX IF NOT EXISTS idx_transactions_debits_vendor_account_date ON transactions(vendor, account_number, date) WHERE status = 'completed' AND price < 0`
+)) createdCount++;
+
+// Superseded: idx_transactions_vendor_account_cycle_date already covers this key
+dropIndexIfExists('idx_transactions_debits_vendor_account_cycle');
+
+// Superseded: repayment scans bound raw dates, served by idx_transactions_debits_vendor_account_date
+dropIndexIfExists('idx_transactions_vendor_account_day');
+
 // Account pairings - account lookups
 if (createIndexIfNotExists('idx_pairings_primary',
   'CREATE INDEX IF NOT EXISTS idx_pairings_primary ON account_pairings(primary_account_id)'
@@ -247,7 +289,7 @@ if (createIndexIfNotExists('idx_messages_timestamp',
 console.log('\n═════════════════════════════════════════');
 console.log(`✅ Index creation complete!`);
 console.log(`   Created: ${createdCount} new indexes`);
-console.log(`   Skipped: ${24 - createdCount} existing indexes`);
+console.log(`   Skipped: ${29 - createdCount} existing indexes`);
 console.log('═════════════════════════════════════════\n');
 
 // Analyze tables for query planner optimization
@@ -1119,6 +1119,7 @@ const INDEX_STATEMENTS = [
   'CREATE INDEX IF NOT EXISTS idx_investment_holdings_status ON investment_holdings (status);',
   'CREATE INDEX IF NOT EXISTS idx_investment_holdings_maturity ON investment_holdings (maturity_date);',
   'CREATE INDEX IF NOT EXISTS idx_investment_holdings_deposit_txn ON investment_holdings (deposit_transaction_id, deposit_transaction_vendor);',
+  'CREATE INDEX IF NOT EXISTS idx_investment_holdings_return_txn ON investment_holdings (return_transaction_id, return_transaction_vendor);',
   'CREATE INDEX IF NOT EXISTS idx_investment_holdings_parent_pikadon ON investment_holdings (parent_pikadon_id);',
   `CREATE UNIQUE INDEX IF NOT EXISTS idx_investment_holdings_standard_snapshot_unique
     ON investment_holdings (account_id, as_of_date)
@@ -1169,6 +1170,11 @@ const INDEX_STATEMENTS = [
   'CREATE INDEX IF NOT EXISTS idx_transactions_cattype_date ON transactions (category_type, date DESC);',
   // Partial index for completed transactions (most common queries)
   `CREATE INDEX IF NOT EXISTS idx_transactions_active_date ON transactions (date DESC) WHERE status = 'completed';`,
+  // Expression index for the card pairing discrepancy scans (per-cycle CC totals)
+  'CREATE INDEX IF NOT EXISTS idx_transactions_vendor_account_cycle_date ON transactions (vendor, account_number, substr(COALESCE(processed_date, date), 1, 10));',
+  // Partial indexes for completed debits (earliest CC cycle lookups, bank repayment date ranges)
+  `CREATE INDEX IF NOT EXISTS idx_transactions_debits_vendor_date ON transactions (vendor, date) WHERE status = 'completed' AND price < 0;`,
+  `CREATE INDEX IF NOT EXISTS idx_transactions_debits_vendor_account_date ON transactions (vendor, account_number, date) WHERE status = 'completed' AND price < 0;`,
   'CREATE INDEX IF NOT EXISTS idx_txn_links_account ON transaction_account_links (account_id);',
   'CREATE INDEX IF NOT EXISTS idx_txn_links_identifier ON transaction_account_links (transaction_identifier);',
   'CREATE INDEX IF NOT EXISTS idx_vendor_credentials_last_scrape ON vendor_credentials (vendor, last_scrape_success DESC);',
@@ -2204,9 +2210,11 @@ function initializeSqliteDatabase(options = {}) {
     });
     runStep('apply schema upgrades', () => applySchemaUpgrades(db));
     runStep('create indexes', () => {
-      for (const statement of INDEX_STATEMENTS) {
-        db.exec(statement);
-      }
+      db.transaction(() => {
+        for (const statement of INDEX_STATEMENTS) {
+          db.exec(statement);
+        }
+      })();
     });
 
     runStep('create FTS5 tables', () => {